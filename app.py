@@ -18,11 +18,12 @@ import re
 from urllib.parse import urlencode, urlparse
 from typing import Optional, Union, Tuple
 from datetime import date as DateType
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 # Import theme functions up front for consolidated styling
-from edge_analysis.ui.theme import inject_theme, inject_header, setup_favicon, get_chart_styler
+from edge_analysis.ui.theme import bootstrap, header_html, get_chart_styler
 
 # ------------------------------- Constants ------------------------------------
 BRAND_PURPLE = "#4800ff"
@@ -72,7 +73,10 @@ def _find_assets_dir() -> Path:
 
 
 ASSETS_DIR = _find_assets_dir()
-FAVICON = ASSETS_DIR / "edge_favicon.png"
+# Prefer the square transparent icon scripts/build_favicon.py produces
+FAVICON = ASSETS_DIR / "edge_favicon_transparent.png"
+if not FAVICON.exists():
+    FAVICON = ASSETS_DIR / "edge_favicon.png"
 PAGE_ICON = str(FAVICON) if FAVICON.exists() else None
 
 st.set_page_config(
@@ -82,9 +86,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Consolidated theme injection; apply once at startup
-inject_theme()
-setup_favicon()
+# Consolidated theme injection; the favicon script is only a fallback for
+# when set_page_config had no icon file to serve
+bootstrap("light", favicon=PAGE_ICON is None)
 
 
 # --- Streamlit version compatibility shim -------------------------------------
@@ -546,8 +550,8 @@ def _verify_database_access(oauth_token: Optional[str], internal_token: Optional
 
 
 # ---- Connect page UI ---------------------------------------------------------
-def _connect_page_css():
-    """Inject CSS specific to the Connect page."""
+def _connect_page_css(header: str = ""):
+    """Inject CSS specific to the Connect page, followed by `header` HTML in the same element."""
     st.markdown(
         f"""
         <style>
@@ -587,6 +591,7 @@ def _connect_page_css():
           .ea-card {{ padding:18px 18px; }}
         }}
         </style>
+        {header}
         """,
         unsafe_allow_html=True,
     )
@@ -600,8 +605,7 @@ def render_connect_page(mobile: bool):
         mobile: Whether to render in mobile mode
     """
     styler = get_chart_styler()
-    inject_header("light")
-    _connect_page_css()
+    _connect_page_css(header_html("light"))
 
     if _handle_oauth_callback():
         pass
@@ -1038,12 +1042,12 @@ def render_dashboard(mobile: bool):
           .ea-empty-title {{ font-size:20px; }}
         }}
         </style>
+        {header_html("light")}
         """,
         unsafe_allow_html=True,
     )
 
     styler = get_chart_styler()
-    inject_header("light")
 
     # Get token and database ID
     token = (
@@ -1126,7 +1130,10 @@ def render_dashboard(mobile: bool):
 
     # Filtered dataframe
     f = df[mask].copy()
-    f["PnL_from_RR"] = f.get("Closed RR", pd.Series(0.0, index=f.index)).fillna(0.0)
+    if "Closed RR" in f.columns:
+        f["PnL_from_RR"] = np.nan_to_num(f["Closed RR"].to_numpy(dtype=np.float32, na_value=np.nan), nan=0.0)
+    else:
+        f["PnL_from_RR"] = np.zeros(len(f), dtype=np.float32)
     stats = generate_overall_stats(f)
 
     # Calculate metrics
@@ -1159,8 +1166,13 @@ def render_dashboard(mobile: bool):
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("<div class='spacer-12'></div>", unsafe_allow_html=True)
 
-    # Render tabs with data
-    render_all_tabs(f, df, styler, show_light_table)
+    # Render tabs with data. Performance tabs only use complete trades, so
+    # hand them that slice directly rather than filtering again per tab prep.
+    if "Is Complete" in f.columns:
+        f_complete = f[f["Is Complete"].to_numpy(dtype=bool)]
+    else:
+        f_complete = f
+    render_all_tabs(f_complete, df, styler, show_light_table)
 
 
 # --------------------------------- Router -------------------------------------
@@ -4,6 +4,7 @@ Data loading module for Edge Analysis.
 
 from __future__ import annotations
 from typing import Optional
+import numpy as np
 import pandas as pd
 import streamlit as st
 import re
@@ -101,21 +102,18 @@ def load_live_df(token: Optional[str], dbid: Optional[str]) -> pd.DataFrame:
     # Filter valid trades (handle None safely)
     has_date = df["Date"].notna() if "Date" in df.columns else pd.Series(False, index=df.index)
     
-    # Build has_signal safely
+    # Build has_signal safely (plain bool arrays, OR-ed in one reduce)
     conditions = []
     if "PnL" in df.columns:
-        conditions.append(df["PnL"].notna())
+        conditions.append(df["PnL"].notna().to_numpy())
     if "Closed RR" in df.columns:
-        conditions.append(df["Closed RR"].notna())
-    if "Result" in df.columns:
-        conditions.append(df["Result"].astype(str).str.strip().ne(""))
-    if "Entry Model" in df.columns:
-        conditions.append(df["Entry Model"].astype(str).str.strip().ne(""))
-    
+        conditions.append(df["Closed RR"].notna().to_numpy())
+    for col in ("Result", "Entry Model"):
+        if col in df.columns:
+            conditions.append(np.char.strip(df[col].to_numpy(dtype=str)) != "")
+
     if conditions:
-        has_signal = conditions[0]
-        for cond in conditions[1:]:
-            has_signal = has_signal | cond
+        has_signal = pd.Series(np.logical_or.reduce(conditions), index=df.index)
     else:
         has_signal = pd.Series(False, index=df.index)
 
@@ -0,0 +1,71 @@
+"""
+Build assets/edge_favicon_transparent.png from the raw favicon mark.
+
+Run from the repo root whenever assets/edge_favicon_mark.png changes:
+
+    python scripts/build_favicon.py [--force]
+
+An output newer than the mark is left alone unless --force is given.
+
+The app serves the result byte-for-byte, so the square canvas and the slow
+optimised PNG encode happen here instead of on every cold start. A 64-colour
+palette version is written instead when it comes out smaller (soft alpha
+edges can quantize poorly). The output can be squeezed further with an
+external tool (e.g. `oxipng -o max`).
+"""
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from PIL import Image, features  # noqa: E402
+
+from edge_analysis.ui.theme import FAVI_PNG, RAW_ICON  # noqa: E402
+
+
+PALETTE_COLORS = 64
+
+
+def _square_canvas(im: Image.Image, size: int = 256) -> Image.Image:
+    """Centre `im` on a transparent size x size canvas (thumbnails `im` in place)."""
+    if im.size == (size, size) and im.mode == "RGBA":
+        return im  # already a finished icon canvas
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    # LANCZOS only pays off for big reductions; a <=2x step is fine with HAMMING
+    box = size - 8
+    ratio = max(im.width, im.height) / box
+    im.thumbnail((box, box), Image.Resampling.LANCZOS if ratio > 2 else Image.Resampling.HAMMING)
+    x = (size - im.width)//2
+    y = (size - im.height)//2
+    canvas.paste(im, (x, y), im)
+    return canvas
+
+
+def _png_bytes(im: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    im.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _palette(im: Image.Image) -> Image.Image:
+    method = (Image.Quantize.LIBIMAGEQUANT if features.check("libimagequant")
+              else Image.Quantize.FASTOCTREE)  # both keep the alpha channel
+    return im.quantize(colors=PALETTE_COLORS, method=method)
+
+
+def main():
+    if not RAW_ICON.exists():
+        sys.exit(f"missing {RAW_ICON}")
+    if ("--force" not in sys.argv[1:] and FAVI_PNG.exists()
+            and FAVI_PNG.stat().st_mtime_ns >= RAW_ICON.stat().st_mtime_ns):
+        print(f"{FAVI_PNG} is up to date")
+        return
+    src = Image.open(RAW_ICON, formats=["PNG"])  # the mark is always PNG: skip format sniffing
+    im = _square_canvas(src.convert("RGBA"), 256)
+    FAVI_PNG.write_bytes(min(_png_bytes(im), _png_bytes(_palette(im)), key=len))
+    print(f"wrote {FAVI_PNG} ({FAVI_PNG.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 from pathlib import Path
+import io
 import json
 import pandas as pd
 
@@ -8,13 +9,15 @@ CANONICAL_ORDER = [
     "Outcome","Closed RR","PnL","Is Complete","Star Rating","Notes"
 ]
 
-def _read_any(path: Path) -> pd.DataFrame:
+def _read_any(path: Path, buf: bytes | None = None) -> pd.DataFrame:
+    """Read a CSV/TSV/XLSX from disk, or from `buf` if given (`path` then only supplies the extension)."""
     p = Path(path)
+    src = io.BytesIO(buf) if buf is not None else p
     if p.suffix.lower() in (".csv", ".tsv"):
         sep = "\t" if p.suffix.lower() == ".tsv" else ","
-        return pd.read_csv(p, sep=sep, dtype=str).fillna("")
+        return pd.read_csv(src, sep=sep, dtype=str).fillna("")
     if p.suffix.lower() in (".xlsx", ".xls"):
-        return pd.read_excel(p, dtype=str).fillna("")
+        return pd.read_excel(src, dtype=str).fillna("")
     raise ValueError(f"Unsupported file type: {p.suffix}")
 
 def _coerce(s: pd.Series, kind: str) -> pd.Series:
@@ -83,13 +86,29 @@ def _adapt_with(df: pd.DataFrame, m: dict) -> pd.DataFrame:
     order = CANONICAL_ORDER + [c for c in out.columns if c not in CANONICAL_ORDER]
     return out[order]
 
-def adapt_auto(file_path: str | Path, mappings_dir: str | Path = "config/templates"):
-    df = _read_any(Path(file_path))
+def _outcome_as_category(df: pd.DataFrame) -> pd.DataFrame:
+    # Outcome has a tiny repeated domain; categorical lets callers validate
+    # against .cat.categories instead of hashing every row.
+    if "Outcome" in df.columns:
+        df["Outcome"] = df["Outcome"].astype("category")
+    return df
+
+def _adapt_loaded(df: pd.DataFrame, mappings_dir: str | Path):
     maps = _load_maps(Path(mappings_dir))
     chosen = _choose(df, maps)
     if not chosen:
-        return df, None
-    return _adapt_with(df, chosen), chosen.get("_name")
+        return _outcome_as_category(df), None
+    return _outcome_as_category(_adapt_with(df, chosen)), chosen.get("_name")
+
+def adapt_auto(file_path: str | Path, mappings_dir: str | Path = "config/templates"):
+    return _adapt_loaded(_read_any(Path(file_path)), mappings_dir)
+
+def adapt_auto_from_buffer(name: str, buf: bytes, mappings_dir: str | Path = "config/templates"):
+    """
+    Same as adapt_auto() but parses in-memory bytes (e.g. a Streamlit upload);
+    `name` is only used to pick the parser from its extension.
+    """
+    return _adapt_loaded(_read_any(Path(name), buf=buf), mappings_dir)
 
 # NEW: allow adapting in-memory DataFrames (e.g., live Notion pulls)
 def adapt_df(df: pd.DataFrame, mappings_dir: str | Path = "config/templates"):
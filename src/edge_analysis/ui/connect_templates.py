@@ -1,13 +1,23 @@
-﻿# src/edge_analysis/ui/connect_notion.py
+﻿# src/edge_analysis/ui/connect_templates.py
 from __future__ import annotations
 from pathlib import Path
-import os, json, base64, secrets, requests
+import os, json, base64, secrets, requests, hashlib, functools, tempfile, threading, time
 from urllib.parse import urlencode
 import pandas as pd
 import streamlit as st
 
 # ADAPTERS (existing JSON adapter kept; plus new profile-based path)
-from edge_analysis.data.template_adapter import adapt_auto, adapt_df
+from edge_analysis.data.template_adapter import adapt_auto_from_buffer, adapt_df
+
+# Faster JSON codec for Notion payloads when available (stdlib fallback)
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
 
 # Profile discovery for the picker (YAML/JSON/TOML)
 try:
@@ -43,6 +53,7 @@ AUTH_BASE = "https://api.notion.com/v1/oauth/authorize"
 TOKEN_URL = "https://api.notion.com/v1/oauth/token"
 NOTION_VER = "2022-06-28"  # pin a version
 
+@functools.lru_cache(maxsize=1)
 def _oauth_cfg():
     client_id = os.getenv("NOTION_CLIENT_ID") or st.secrets.get("NOTION_CLIENT_ID")
     client_secret = os.getenv("NOTION_CLIENT_SECRET") or st.secrets.get("NOTION_CLIENT_SECRET")
@@ -65,18 +76,23 @@ def _auth_url():
     }
     return f"{AUTH_BASE}?{urlencode(params)}"
 
+@functools.lru_cache(maxsize=1)
+def _oauth_basic_header() -> str:
+    # Client credentials are fixed for the process; encode them once
+    client_id, client_secret, _ = _oauth_cfg()
+    return "Basic " + base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+
 def _exchange_code_for_token(code: str) -> dict:
-    client_id, client_secret, redirect_uri = _oauth_cfg()
-    basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    _, _, redirect_uri = _oauth_cfg()
     headers = {
-        "Authorization": f"Basic {basic}",
+        "Authorization": _oauth_basic_header(),
         "Content-Type": "application/json",
         "Notion-Version": NOTION_VER,
     }
     body = {"grant_type": "authorization_code", "code": code, "redirect_uri": redirect_uri}
-    r = requests.post(TOKEN_URL, headers=headers, data=json.dumps(body), timeout=30)
+    r = requests.post(TOKEN_URL, headers=headers, data=_dumps(body), timeout=30)
     r.raise_for_status()
-    return r.json()
+    return _loads(r.content)
 
 def _fetch_databases(access_token: str) -> list[dict]:
     headers = {
@@ -85,15 +101,64 @@ def _fetch_databases(access_token: str) -> list[dict]:
         "Content-Type": "application/json",
     }
     payload = {"query": "", "filter": {"value": "database", "property": "object"}, "page_size": 25}
-    r = requests.post("https://api.notion.com/v1/search", headers=headers, data=json.dumps(payload), timeout=30)
+    r = requests.post("https://api.notion.com/v1/search", headers=headers, data=_dumps(payload), timeout=30)
     r.raise_for_status()
-    return r.json().get("results", [])
+    return _loads(r.content).get("results", [])
 
 # --------- Minimal Notion → DataFrame helpers (preview + normalization) ---------
 
-def _notion_query_database(access_token: str, dbid: str, limit: int = 200) -> list[dict]:
+# Notion allows ~3 requests/s per integration; back off on 429
+_NOTION_RETRIES = 3
+
+def _get_database_schema(access_token: str, dbid: str) -> dict:
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Notion-Version": NOTION_VER,
+    }
+    url = f"https://api.notion.com/v1/databases/{dbid}"
+    for attempt in range(_NOTION_RETRIES + 1):
+        r = requests.get(url, headers=headers, timeout=30)
+        if r.status_code != 429 or attempt == _NOTION_RETRIES:
+            break
+        # Rate limited: wait as long as Notion asks (capped), then retry
+        try:
+            wait = float(r.headers.get("Retry-After", ""))
+        except ValueError:
+            wait = 2.0 ** attempt
+        time.sleep(min(max(wait, 0.5), 10.0))
+    r.raise_for_status()
+    return _loads(r.content)
+
+@st.cache_data(show_spinner=False, ttl=600)
+def _cached_database_schema(access_token: str, dbid: str) -> dict:
+    """One database's schema, cached per database. Failures raise, so they aren't cached."""
+    return _get_database_schema(access_token, dbid)
+
+def _selected_database_schema(access_token: str, dbid: str) -> dict | None:
+    """
+    Schema of the selected database, only when profiles are available to use
+    it (suggestion + filter_properties); None otherwise or if it can't be read.
+    """
+    if not discover_profiles:
+        return None
+    try:
+        return _cached_database_schema(access_token, dbid)
+    except Exception:
+        return None
+
+def _property_ids(schema: dict | None, names: list[str]) -> list[str]:
+    """
+    Notion property ids for the given property names. Empty when the schema
+    is unknown or nothing matches, which means "pull every property".
+    """
+    props = (schema or {}).get("properties", {})
+    return [props[n]["id"] for n in names if n in props and props[n].get("id")]
+
+def _notion_query_database(access_token: str, dbid: str, limit: int = 200,
+                           property_ids: list[str] | None = None) -> list[dict]:
     """
     Returns a list of page objects (raw Notion items) for preview/normalization.
+    If property_ids is given, Notion only returns those properties per page.
     """
     headers = {
         "Authorization": f"Bearer {access_token}",
@@ -101,12 +166,14 @@ def _notion_query_database(access_token: str, dbid: str, limit: int = 200) -> li
         "Content-Type": "application/json",
     }
     url = f"https://api.notion.com/v1/databases/{dbid}/query"
+    if property_ids:
+        url += "?" + urlencode([("filter_properties", pid) for pid in property_ids])
     payload = {"page_size": 100}
     out = []
     while True:
-        r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=30)
+        r = requests.post(url, headers=headers, data=_dumps(payload), timeout=30)
         r.raise_for_status()
-        data = r.json()
+        data = _loads(r.content)
         out.extend(data.get("results", []))
         if len(out) >= limit:
             break
@@ -117,11 +184,10 @@ def _notion_query_database(access_token: str, dbid: str, limit: int = 200) -> li
     return out[:limit]
 
 def _rich_to_text(rt):
-    # Convert Notion rich_text/title array to plain text
-    try:
-        return "".join([t.get("plain_text","") for t in (rt or [])]).strip()
-    except Exception:
+    # Convert Notion rich_text/title array to plain text; empty cells are the common case
+    if not rt or not isinstance(rt, list):
         return ""
+    return "".join(t.get("plain_text","") for t in rt).strip()
 
 def _prop_to_value(prop: dict):
     """
@@ -192,26 +258,112 @@ def _results_to_df(results: list[dict]) -> pd.DataFrame:
     # fill empties so UI doesn't choke
     return df
 
+# Canonical columns shown in the profile debug preview (in display order)
+_PREVIEW_COLS = pd.Index([
+    "Date","Pair","Session","Entry Model","Entry Confluence",
+    "Entry Confluence List","__first_conf",
+    "Outcome","Outcome Canonical","Closed RR","Closed RR Num",
+    "PnL","Is Complete"
+])
+
+@st.cache_data(show_spinner=False)
+def _preview_slice(key: tuple, cols: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """First 25 rows of the debug preview; `key` identifies the pull so reruns reuse it."""
+    return _df[list(cols)].head(25)
+
 # -------------------- Profile picker state (last-used per DB) --------------------
 
 _PROFILE_STATE = Path(".ea_profile_state.json")
+# Sessions are threads in one process; serializes their read-merge-write
+_PROFILE_STATE_LOCK = threading.Lock()
+
+def _read_profile_state() -> dict:
+    try:
+        state = json.loads(_PROFILE_STATE.read_text())
+    except Exception:
+        return {}
+    return state if isinstance(state, dict) else {}
 
 def _load_profile_state() -> dict:
-    if _PROFILE_STATE.exists():
+    # Read from disk once per session; later reruns reuse the in-session copy
+    cached = st.session_state.get("_profile_state")
+    if cached is not None:
+        return cached
+    state = _read_profile_state()
+    st.session_state["_profile_state"] = state
+    return state
+
+def _save_profile_state(dbid: str, profile_name: str):
+    """
+    Record the last-used profile for one database. The file is shared by all
+    sessions, so the change is merged into what's on disk now (not this
+    session's snapshot) and swapped in through a unique temp file.
+    """
+    with _PROFILE_STATE_LOCK:
+        state = _read_profile_state()
+        last_used = state.get("last_used")
+        if not isinstance(last_used, dict):
+            last_used = state["last_used"] = {}
+        last_used[dbid] = profile_name
         try:
-            return json.loads(_PROFILE_STATE.read_text())
+            fd, tmp = tempfile.mkstemp(dir=_PROFILE_STATE.parent.resolve(), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    # mkstemp creates 0600; keep the usual mode for the shared file
+                    try:
+                        os.fchmod(f.fileno(), _PROFILE_STATE.stat().st_mode & 0o777)
+                    except OSError:
+                        os.fchmod(f.fileno(), 0o644)
+                    f.write(json.dumps(state, indent=2))
+                os.replace(tmp, _PROFILE_STATE)
+            except Exception:
+                os.unlink(tmp)
+                raise
         except Exception:
-            pass
-    return {}
+            pass  # read-only env: still remembered for this session below
+    st.session_state["_profile_state"] = state
 
-def _save_profile_state(state: dict):
-    _PROFILE_STATE.write_text(json.dumps(state, indent=2))
+def _templates_signature(dir_str: str) -> tuple:
+    """(name, mtime_ns, size) of every file in the templates dir; changes when a profile is edited."""
+    try:
+        return tuple(sorted(
+            (p.name, s.st_mtime_ns, s.st_size)
+            for p in Path(dir_str).iterdir()
+            for s in (p.stat(),)
+        ))
+    except OSError:
+        return ()
+
+@st.cache_resource(show_spinner=False)
+def _discover_profiles_cached(dir_str: str, signature: tuple) -> list[dict]:
+    return discover_profiles(Path(dir_str)) if discover_profiles else []
+
+def _profile_source_columns(profile_name: str | None) -> list[str]:
+    """Notion property names the given profile maps from (empty if unknown)."""
+    if not profile_name or not discover_profiles:
+        return []
+    for p in _discover_profiles_cached("assets/templates", _templates_signature("assets/templates")):
+        if p.get("name") == profile_name:
+            return list((p.get("columns") or {}).keys())
+    return []
+
+def _suggest_profile(schema: dict | None) -> str | None:
+    """Profile whose mapped columns overlap most with the database's property names."""
+    props = set((schema or {}).get("properties", {}))
+    if not props or not discover_profiles:
+        return None
+    best, best_hits = None, 0
+    for p in _discover_profiles_cached("assets/templates", _templates_signature("assets/templates")):
+        hits = len(props & set((p.get("columns") or {}).keys()))
+        if hits > best_hits:
+            best, best_hits = p.get("name"), hits
+    return best
 
 def _pick_template_name(default: str | None = None) -> str | None:
     if not discover_profiles:
         st.warning("Template profiles module not available. Did you add Step 2 (template_profiles.py)?")
         return None
-    profs = discover_profiles(Path("assets/templates"))
+    profs = _discover_profiles_cached("assets/templates", _templates_signature("assets/templates"))
     names = [p.get("name") for p in profs if p.get("name")]
     if not names:
         st.warning("No template profiles found in assets/templates.")
@@ -248,18 +400,21 @@ def render_connect_page():
     )
     _render_source_badge()
 
-    # ----- callback handling
-    try:
-        qp = st.query_params
-    except Exception:
-        qp = st.experimental_get_query_params()
+    authed = "notion_auth" in st.session_state
 
-    code = qp.get("code")
-    state = qp.get("state")
-    if isinstance(code, list): code = code[0]
-    if isinstance(state, list): state = state[0]
+    # ----- callback handling (only needed until we hold a token)
+    code = state = None
+    if not authed:
+        if hasattr(st, "query_params"):
+            qp = st.query_params
+            code = qp.get("code", "")
+            state = qp.get("state", "")
+        else:
+            qp = st.experimental_get_query_params()
+            code = (qp.get("code") or [""])[0]
+            state = (qp.get("state") or [""])[0]
 
-    if code and "notion_auth" not in st.session_state:
+    if code:
         with st.status("Completing Notion sign-in…", expanded=True) as s:
             if state != st.session_state.get("oauth_state"):
                 st.error("OAuth state mismatch. Please try again.")
@@ -282,8 +437,7 @@ def render_connect_page():
                         pass
                 except Exception as e:
                     st.error(f"Token exchange failed: {e}")
-
-    authed = "notion_auth" in st.session_state
+        authed = "notion_auth" in st.session_state
 
     # ----- unauthenticated UI
     if not authed:
@@ -300,7 +454,7 @@ def render_connect_page():
     cols = st.columns([1,1,1])
     with cols[0]:
         if st.button("Disconnect", type="secondary", use_container_width=True):
-            for k in ["notion_auth", "selected_database", "normalized_sample"]:
+            for k in ["notion_auth", "selected_database", "normalized_sample", "_normalized_sample_key"]:
                 st.session_state.pop(k, None)
             # If nothing else is connected, fall back to demo
             if st.session_state.get("data_source") == "notion":
@@ -338,21 +492,26 @@ def render_connect_page():
 
     # --------- If a DB is selected, fetch a small sample and normalize via profile ---------
     if selected_id:
+        # Template picker + last used per DB
+        dbid = str(selected_id)
+        state_obj = _load_profile_state()
+        last_used = state_obj.get("last_used", {}).get(dbid)
+        schema = _selected_database_schema(info["access_token"], dbid)
+        profile_name = _pick_template_name(default=last_used or _suggest_profile(schema))
+
+        # Only request the properties the chosen profile maps (full pull if unknown)
+        prop_ids = _property_ids(schema, _profile_source_columns(profile_name))
+
         with st.spinner("Pulling a sample from Notion…"):
             try:
-                results = _notion_query_database(info["access_token"], selected_id, limit=200)
+                results = _notion_query_database(info["access_token"], selected_id, limit=200,
+                                                 property_ids=prop_ids)
                 df_raw = _results_to_df(results)
             except Exception as e:
                 st.error(f"Failed to read rows from Notion: {e}")
                 df_raw = pd.DataFrame()
 
         if df_raw is not None and not df_raw.empty:
-            # Template picker + last used per DB
-            dbid = str(selected_id)
-            state_obj = _load_profile_state()
-            last_used = state_obj.get("last_used", {}).get(dbid)
-            profile_name = _pick_template_name(default=last_used)
-
             # Optional: per-DB overrides could be added here; for now we pass none.
             overrides = {}
 
@@ -364,26 +523,27 @@ def render_connect_page():
                 overrides=overrides
             )
 
-            # Remember last used profile per DB
-            if used_profile:
-                state_obj.setdefault("last_used", {})[dbid] = used_profile
-                _save_profile_state(state_obj)
+            # Remember last used profile per DB (only hit disk when it changes)
+            if used_profile and last_used != used_profile:
+                _save_profile_state(dbid, used_profile)
+
+            # Identifies this normalized pull across reruns
+            first_page = df_norm["__page_id"].iloc[0] if "__page_id" in df_norm.columns else None
+            sample_key = (dbid, used_profile, df_norm.shape, first_page)
 
             # Store a tiny normalized sample in session for other pages if needed
-            st.session_state["normalized_sample"] = df_norm.head(50).copy()
+            if st.session_state.get("_normalized_sample_key") != sample_key:
+                st.session_state["normalized_sample"] = df_norm.iloc[:50]
+                st.session_state["_normalized_sample_key"] = sample_key
 
             # Debug / preview
             with st.expander("🔎 Profile Debug", expanded=False):
                 st.write("Profile used:", used_profile or "(none)")
                 st.write("Raw rows:", len(df_raw), "• Normalized rows:", len(df_norm))
-                cols_to_show = [c for c in [
-                    "Date","Pair","Session","Entry Model","Entry Confluence",
-                    "Entry Confluence List","__first_conf",
-                    "Outcome","Outcome Canonical","Closed RR","Closed RR Num",
-                    "PnL","Is Complete"
-                ] if c in df_norm.columns]
-                if cols_to_show:
-                    st.dataframe(df_norm[cols_to_show].head(25), use_container_width=True)
+                cols_to_show = _PREVIEW_COLS.intersection(df_norm.columns, sort=False)
+                if len(cols_to_show):
+                    st.dataframe(_preview_slice(sample_key, tuple(cols_to_show), df_norm),
+                                 use_container_width=True)
                 else:
                     st.write("No expected canonical columns found. Check your template profile mapping.")
 
@@ -408,6 +568,45 @@ def render_connect_page():
 MY_NOTION_TEMPLATE_URL = "https://lumpy-zone-638.notion.site/27d77800f9cb8187ba04f3ed2336a581?v=27d77800f9cb81d2bd55000c05303a28&source=copy_link"
 TRADINGPOOLS_TEMPLATE_URL = "https://hallowed-silicon-4e7.notion.site/2743b411646e8039b4d1e70637ff8c80?v=2743b411646e817e94b4000c5bacc90a&source=copy_link"
 
+@st.cache_data(show_spinner=False)
+def _cached_adapt_auto(digest: str, name: str, _buf: bytes) -> tuple[pd.DataFrame, str | None]:
+    """
+    Parse an uploaded template once per unique content (keyed by `digest`),
+    so reruns after an upload skip the CSV/XLSX parse.
+    """
+    return adapt_auto_from_buffer(name, _buf, "config/templates")
+
+def parse_template_upload(up) -> tuple[pd.DataFrame, str | None, list[str]]:
+    """
+    Shared upload pipeline for both template UIs: parse the uploaded file
+    (cached by content hash) and return (df, mapping_name, issues).
+    """
+    buf = up.getbuffer()
+    digest = hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+    # Keep a copy on disk only when explicitly debugging uploads
+    if os.getenv("EA_DEBUG_UPLOADS"):
+        uploads = Path("uploads"); uploads.mkdir(parents=True, exist_ok=True)
+        with open(uploads / up.name, "wb") as f:
+            f.write(buf)
+
+    df, mapping_name = _cached_adapt_auto(digest, up.name, bytes(buf))
+
+    issues: list[str] = []
+    for col in ["Date", "Pair", "Outcome", "Closed RR", "Is Complete"]:
+        if col not in df.columns:
+            issues.append(f"Missing required column: {col}")
+
+    if "Outcome" in df.columns:
+        try:
+            unexpected = sorted(str(c) for c in set(df["Outcome"].cat.categories) - {"Win", "BE", "Loss"})
+            if unexpected:
+                issues.append(f"Unexpected Outcome values: {unexpected[:5]}")
+        except Exception:
+            pass
+
+    return df, mapping_name, issues
+
 def render_connect_notion_templates_ui():
     """Call this if you want the classic full-page templates section."""
     st.subheader("Templates (Notion)")
@@ -451,32 +650,12 @@ def render_connect_notion_templates_ui_body_only():
     if not up:
         return
 
-    uploads = Path("uploads"); uploads.mkdir(parents=True, exist_ok=True)
-    fpath = uploads / up.name
-    with open(fpath, "wb") as f:
-        f.write(up.getbuffer())
-
-    df, mapping_name = adapt_auto(fpath, "config/templates")
+    df, mapping_name, issues = parse_template_upload(up)
     if mapping_name:
         st.success(f"Detected template: **{mapping_name}**")
     else:
         st.warning("No mapping detected. Ensure the header row is intact in your export.")
 
-    issues: list[str] = []
-    for col in ["Date", "Pair", "Outcome", "Closed RR", "Is Complete"]:
-        if col not in df.columns:
-            issues.append(f"Missing required column: {col}")
-
-    if "Outcome" in df.columns:
-        try:
-            bad = ~df["Outcome"].isin(["Win", "BE", "Loss"]) & df["Outcome"].notna()
-            if bad.any():
-                issues.append(
-                    f"Unexpected Outcome values: {list(df.loc[bad, 'Outcome'].astype(str).unique()[:5])}"
-                )
-        except Exception:
-            pass
-
     if issues:
         st.markdown("**Checks**")
         st.markdown("\n".join(f"- {m}" for m in issues))
@@ -1,14 +1,29 @@
 from __future__ import annotations
 import numpy as np
 import pandas as pd
-import altair as alt
 import streamlit as st
 from pathlib import Path  # PATCH: for template download paths
 import re  # for splitting entry model strings
 import os
+import hashlib
+import functools
+from contextlib import contextmanager
 from datetime import time as dt_time
 from zoneinfo import ZoneInfo
 
+# Optional: Polars splits very large entry-model columns faster (pandas fallback)
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Optional: Arrow-backed strings keep the per-tab .str passes in C (object fallback)
+try:
+    import pyarrow  # noqa: F401
+    _STR_DTYPE = "string[pyarrow]"
+except ImportError:
+    _STR_DTYPE = None
+
 # NEW: import the three clean renderers from components
 from edge_analysis.ui.components import (
     render_entry_model_table,
@@ -17,17 +32,73 @@ from edge_analysis.ui.components import (
     render_timeframe_table,
 )
 
-# PATCH: auto-detect adapter for multiple templates
-from edge_analysis.data.template_adapter import adapt_auto
+# PATCH: auto-detect adapter for multiple templates (shared with the Connect page)
+from edge_analysis.ui.connect_templates import parse_template_upload
+from edge_analysis.ui.theme import get_vega_config
+
+# Copy-on-write (the default from pandas 3) lets the normalisation helpers take
+# shallow copies: columns are only duplicated when one of them is written to.
+if pd.__version__.startswith("2."):
+    pd.set_option("mode.copy_on_write", True)
 
 CONFLUENCE_OPTIONS = ["DIV", "Sweep", "DIV & Sweep"]
+_OUTCOME_LEVELS = ["Win", "BE", "Loss"]
+_SESSION_LEVELS = ["Asia", "London", "New York", "Other"]
+_DAY_LEVELS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# str() forms of an empty label cell
+_BLANKS = frozenset({"", "nan", "NaN", "None"})
+
+# Patterns applied per row/label; compiled once at import
+# List delimiters ; , / | + collapsed to "," so splitting is a plain str.split
+_DELIM_TRANS = str.maketrans(";/|+", ",,,,")
+_POLARS_MIN_ROWS = 100_000  # below this, conversion costs more than it saves
+_NON_ALPHA_RE = re.compile(r"[^a-z]")
+# Target RR labels: "a-b" range, "a+" open-ended or plain "a" (after dropping "rr")
+_RR_LABEL_RE = re.compile(r"^([+-]?\d+(?:\.\d+)?)(?:[-–]([+-]?\d+(?:\.\d+)?)|(\+))?$")
+
+
+# Display overrides for instrument names; everything else shows as-is
+_ASSET_LABELS = {"Gold": "GOLD"}
 
 
 def _asset_label(name: str) -> str:
-    return "GOLD" if str(name) == "Gold" else str(name)
+    return _ASSET_LABELS.get(str(name), str(name))
+
+
+def _asset_labels(names: pd.Series) -> pd.Series:
+    """_asset_label over a whole column as one vectorised replace."""
+    return names.astype(str).replace(_ASSET_LABELS)
+
+
+@contextmanager
+def _section():
+    """
+    Wrap a tab body in a themed `.section` card. A keyed container (styled via
+    its `st-key-section` class) holds the children without any extra markdown
+    calls; only one section renders per run, so the fixed key is unique.
+    """
+    try:
+        box = st.container(key="section")
+    except TypeError:
+        box = None  # Streamlit < 1.39: no keyed containers
+    if box is None:
+        st.markdown('<div class="section">', unsafe_allow_html=True)
+        try:
+            yield
+        finally:
+            st.markdown("</div>", unsafe_allow_html=True)
+        return
+    with box:
+        yield
 
 
 # ─────────────────────────── Session/Date helpers (NEW) ──────────────────────
+@functools.lru_cache(maxsize=32)
+def _tz(name: str) -> ZoneInfo:
+    """ZoneInfo lookup memoised by name (each miss reads tzdata from disk)."""
+    return ZoneInfo(name)
+
+
 def _extract_iso_from_notion(v):
     """Accept Notion date property dicts/lists or plain strings/numbers."""
     try:
@@ -40,6 +111,77 @@ def _extract_iso_from_notion(v):
     return v
 
 
+def _unwrap_notion_values(col: pd.Series) -> pd.Series:
+    """Unwrap Notion dict/list cells only where present; other cells pass through untouched."""
+    if col.dtype != object:
+        return col
+    vals = col.to_numpy(dtype=object)
+    nested = np.fromiter((isinstance(v, (dict, list, tuple)) for v in vals), dtype=bool, count=len(vals))
+    if not nested.any():
+        return col
+    vals = vals.copy()
+    vals[nested] = [_extract_iso_from_notion(v) for v in vals[nested]]
+    return pd.Series(vals, index=col.index, name=col.name)
+
+
+def _epoch_to_utc(num: pd.Series) -> pd.Series:
+    """Epoch numbers → UTC datetimes; values above 1e11 are milliseconds, the rest seconds."""
+    num = pd.to_numeric(num, errors="coerce").astype("float64")
+    ms = np.where(num.to_numpy() > 10 ** 11, num.to_numpy(), num.to_numpy() * 1000.0)
+    return pd.to_datetime(pd.Series(np.floor(ms), index=num.index), unit="ms", utc=True, errors="coerce")
+
+
+def _to_datetime_iso_first(s: pd.Series, utc: bool = False) -> pd.Series:
+    """
+    pd.to_datetime via the C ISO8601 parser; only the values it rejects get a
+    second, format-inferring pass (the slow dateutil path).
+
+    The fallback always parses with utc=True so mixed offsets / naive values
+    can't raise; with utc=False a mix of aware and naive results is returned
+    naive (wall-clock time). Values neither pass can parse are NaT.
+    """
+    try:
+        s_dt = pd.to_datetime(s, utc=utc, errors="coerce", format="ISO8601")
+    except (ValueError, TypeError):
+        # Mixed UTC offsets: only a common (UTC) timezone can hold them
+        s_dt = pd.to_datetime(s, utc=True, errors="coerce", format="ISO8601")
+        if not utc:
+            s_dt = s_dt.dt.tz_localize(None)
+    missed = s_dt.isna() & s.notna()
+    if missed.any():
+        try:
+            retry = pd.to_datetime(s[missed], utc=True, errors="coerce")
+            if not utc:
+                retry = retry.dt.tz_localize(None)
+                if s_dt.dt.tz is not None:
+                    s_dt = s_dt.dt.tz_localize(None)
+            s_dt.loc[missed] = retry
+        except (ValueError, TypeError):
+            pass  # leave those rows NaT
+    return s_dt
+
+
+def _parse_datetime_column(col: pd.Series) -> pd.Series:
+    """Vectorised parse of one datetime-like column (ISO strings, epochs, Notion dicts)."""
+    if pd.api.types.is_bool_dtype(col):
+        return pd.Series(pd.NaT, index=col.index, dtype="datetime64[ns, UTC]")
+    if pd.api.types.is_numeric_dtype(col):
+        return _epoch_to_utc(col)
+    s = _unwrap_notion_values(col)
+    vals = s.to_numpy(dtype=object)
+    is_num = np.fromiter(
+        (isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in vals),
+        dtype=bool,
+        count=len(vals),
+    )
+    if is_num.all():
+        return _epoch_to_utc(s)
+    s_dt = _to_datetime_iso_first(s.mask(is_num), utc=True)
+    if is_num.any():
+        s_dt.loc[is_num] = _epoch_to_utc(s[is_num])
+    return s_dt
+
+
 def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
     """
     Return a UTC-aware datetime Series from a variety of column schemes:
@@ -65,23 +207,7 @@ def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
     # 1) Single datetime-like
     for c in cand_single:
         if c in df.columns:
-            s = df[c].map(_extract_iso_from_notion)
-
-            def _num_to_ts(x):
-                try:
-                    if x is None or (isinstance(x, float) and pd.isna(x)):
-                        return None
-                    if isinstance(x, (int, float)) and not isinstance(x, bool):
-                        x = int(x)
-                        if x > 10 ** 11:  # ms
-                            return pd.to_datetime(x, unit="ms", utc=True)
-                        return pd.to_datetime(x, unit="s", utc=True)
-                    return x
-                except Exception:
-                    return x
-
-            s = s.map(_num_to_ts)
-            s_dt = pd.to_datetime(s, utc=True, errors="coerce")
+            s_dt = _parse_datetime_column(df[c])
             break
     else:
         s_dt = None
@@ -91,7 +217,7 @@ def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
         dcol = next((c for c in cand_date if c in df.columns), None)
         tcol = next((c for c in cand_time if c in df.columns), None)
         if dcol and tcol:
-            s_date = pd.to_datetime(df[dcol].map(_extract_iso_from_notion), errors="coerce")
+            s_date = pd.to_datetime(_unwrap_notion_values(df[dcol]), errors="coerce")
             s_time = df[tcol].astype(str).str.strip().replace({"": "00:00"})
             s_dt = pd.to_datetime(
                 s_date.dt.strftime("%Y-%m-%d") + " " + s_time,
@@ -102,7 +228,7 @@ def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
     if s_dt is None:
         dcol = next((c for c in cand_date if c in df.columns), None)
         if dcol:
-            s_date = pd.to_datetime(df[dcol].map(_extract_iso_from_notion), errors="coerce")
+            s_date = pd.to_datetime(_unwrap_notion_values(df[dcol]), errors="coerce")
             s_dt = pd.to_datetime(s_date.dt.strftime("%Y-%m-%d") + " 00:00", errors="coerce")
 
     if s_dt is None:
@@ -110,7 +236,7 @@ def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
 
     # Localize → UTC
     try:
-        tz = ZoneInfo(str(tz_name or "UTC"))
+        tz = _tz(str(tz_name or "UTC"))
         if s_dt.dt.tz is None:
             s_dt = s_dt.dt.tz_localize(tz).dt.tz_convert("UTC")
         else:
@@ -129,34 +255,26 @@ def _coerce_datetime_series(df: pd.DataFrame, tz_name: str = "UTC"):
 # Sessions defined in THEIR LOCAL MARKET TIME (handles DST correctly)
 _SESSIONS = {
     "Asia": {
-        "tz": ZoneInfo("Asia/Tokyo"),
+        "tz": _tz("Asia/Tokyo"),
         "start": dt_time(9, 0),
         "end": dt_time(18, 0),
     },  # 09:00–18:00 Tokyo
     "London": {
-        "tz": ZoneInfo("Europe/London"),
+        "tz": _tz("Europe/London"),
         "start": dt_time(8, 0),
         "end": dt_time(17, 0),
     },  # 08:00–17:00 London
     "New York": {
-        "tz": ZoneInfo("America/New_York"),
+        "tz": _tz("America/New_York"),
         "start": dt_time(8, 0),
         "end": dt_time(17, 0),
     },  # 08:00–17:00 NY
 }
-
-
-def _time_in_window(local_dt: pd.Timestamp, start: dt_time, end: dt_time) -> bool:
-    """
-    True if local_dt's local time is within [start, end).
-    Handles windows that cross midnight (not used here but robust).
-    """
-    if pd.isna(local_dt):
-        return False
-    t = local_dt.timetz()
-    if start <= end:
-        return start <= t < end
-    return (t >= start) or (t < end)
+# Window bounds as seconds since local midnight for the vectorised classifier
+for _cfg in _SESSIONS.values():
+    _cfg["start_sec"] = _cfg["start"].hour * 3600 + _cfg["start"].minute * 60
+    _cfg["end_sec"] = _cfg["end"].hour * 3600 + _cfg["end"].minute * 60
+del _cfg
 
 
 def _classify_session_market_local(ts_aware: pd.Timestamp) -> str | None:
@@ -164,22 +282,44 @@ def _classify_session_market_local(ts_aware: pd.Timestamp) -> str | None:
     Classify into Asia / London / New York using each market's local clock.
     If multiple sessions overlap, choose by priority: New York > London > Asia.
     (Only used as a fallback now; primary source is the template Session field.)
+    Scalar entry point kept for callers; the work is done column-wise.
     """
     if ts_aware is None or pd.isna(ts_aware):
         return None
+    return _classify_sessions_vectorized(pd.Series([pd.Timestamp(ts_aware)]))[0]
 
-    active = []
-    for name, cfg in _SESSIONS.items():
-        local = ts_aware.astimezone(cfg["tz"])
-        if _time_in_window(local, cfg["start"], cfg["end"]):
-            active.append(name)
-
-    if not active:
-        return "Other"
 
-    for winner in ["New York", "London", "Asia"]:
-        if winner in active:
-            return winner
+def _classify_sessions_vectorized(ts_utc: pd.Series) -> np.ndarray:
+    """
+    Session label per UTC timestamp (None for NaT); rules as in
+    `_classify_session_market_local`. Later markets overwrite earlier ones,
+    so iterating Asia → London → New York yields the NY > London > Asia
+    priority.
+
+    UTC offsets only change on hour boundaries, so each market's offset is
+    resolved once per distinct UTC hour and broadcast back to the rows; the
+    per-row work is plain int64 arithmetic on seconds.
+    """
+    result = np.full(len(ts_utc), "Other", dtype=object)
+    na = ts_utc.isna().to_numpy()
+    utc_s = ts_utc.to_numpy(dtype="datetime64[s]").astype(np.int64)
+    utc_s[na] = 0
+    hours, inv = np.unique(utc_s // 3600, return_inverse=True)
+    hour_starts = hours * 3600
+    hour_idx = pd.DatetimeIndex(hour_starts.astype("datetime64[s]")).tz_localize("UTC")
+    for name in ["Asia", "London", "New York"]:
+        cfg = _SESSIONS[name]
+        local_starts = hour_idx.tz_convert(cfg["tz"]).tz_localize(None)
+        offset = local_starts.to_numpy(dtype="datetime64[s]").astype(np.int64) - hour_starts
+        secs = (utc_s + offset[inv.ravel()]) % 86400
+        start, end = cfg["start_sec"], cfg["end_sec"]
+        if start <= end:
+            mask = (secs >= start) & (secs < end)
+        else:
+            mask = (secs >= start) | (secs < end)
+        result[mask] = name
+    result[na] = None
+    return result
 
 
 def _clean_session_value(v):
@@ -204,6 +344,15 @@ def _clean_session_value(v):
     return s
 
 
+def _clean_session_labels(s: pd.Series) -> pd.Series:
+    """_clean_session_value applied once per distinct label instead of per row."""
+    try:
+        mapping = {v: _clean_session_value(v) for v in pd.unique(s.dropna())}
+    except TypeError:  # unhashable cells (e.g. raw Notion lists)
+        return s.map(_clean_session_value)
+    return s.map(mapping)
+
+
 def _ensure_session_and_day(df: pd.DataFrame) -> pd.DataFrame:
     """
     Ensure we have 'Session Norm' and 'DayName'.
@@ -216,68 +365,117 @@ def _ensure_session_and_day(df: pd.DataFrame) -> pd.DataFrame:
       3) Only if neither Session Norm nor Session exists do we
          fall back to time-based classification from timestamps.
     """
-    if df is None or df.empty:
-        return df
-    out = df.copy()
+    return _normalize_frame(df, want_models=False, want_instrument=False)
+
+
+def _fill_session_and_day(out: pd.DataFrame) -> None:
+    """In-place body of _ensure_session_and_day (see there for the priority rules)."""
+    sessions_tz = os.getenv("EDGE_SESSIONS_TZ", "Australia/Sydney")
+    local_tz_name = os.getenv("EDGE_LOCAL_TZ", "Australia/Sydney")
 
     # ---- Case 1: Session Norm already exists (from adapter/template) ----
     if "Session Norm" in out.columns and not out["Session Norm"].isna().all():
-        # Clean labels a bit
-        out["Session Norm"] = out["Session Norm"].map(_clean_session_value)
+        # Clean labels a bit; adapter output is usually clean already, in which
+        # case the column is left as is and nothing is written to the frame
+        cleaned = _clean_session_labels(out["Session Norm"])
+        if not cleaned.equals(out["Session Norm"]):
+            out["Session Norm"] = cleaned
 
         # Still compute DayName if missing/empty
         if "DayName" not in out.columns or out["DayName"].isna().all():
-            s_dt = _coerce_datetime_series(out, tz_name=os.getenv("EDGE_SESSIONS_TZ", "Australia/Sydney"))
+            s_dt = _coerce_datetime_series(out, tz_name=sessions_tz)
             if s_dt is not None:
                 try:
-                    local_tz = ZoneInfo(os.getenv("EDGE_LOCAL_TZ", "Australia/Sydney"))
+                    local_tz = _tz(local_tz_name)
                     out["DayName"] = s_dt.dt.tz_convert(local_tz).dt.day_name()
                 except Exception:
                     out["DayName"] = s_dt.dt.day_name()
-        return out
+        return
 
     # ---- Case 2: No Session Norm, but we DO have a Session column ----
     if "Session" in out.columns:
-        out["Session Norm"] = out["Session"].map(_clean_session_value)
+        out["Session Norm"] = _clean_session_labels(out["Session"])
 
         # DayName: derive from datetime if possible, else from Date
         if "DayName" not in out.columns or out["DayName"].isna().all():
-            s_dt = _coerce_datetime_series(out, tz_name=os.getenv("EDGE_SESSIONS_TZ", "Australia/Sydney"))
+            s_dt = _coerce_datetime_series(out, tz_name=sessions_tz)
             if s_dt is not None:
                 try:
-                    local_tz = ZoneInfo(os.getenv("EDGE_LOCAL_TZ", "Australia/Sydney"))
+                    local_tz = _tz(local_tz_name)
                     out["DayName"] = s_dt.dt.tz_convert(local_tz).dt.day_name()
                 except Exception:
                     out["DayName"] = s_dt.dt.day_name()
             elif "Date" in out.columns:
                 dts = pd.to_datetime(out["Date"], errors="coerce")
                 out["DayName"] = dts.dt.day_name()
-        return out
+        return
 
     # ---- Case 3: No Session Norm and no Session → LAST-RESORT time-based ----
-    s_dt_utc = _coerce_datetime_series(out, tz_name=os.getenv("EDGE_SESSIONS_TZ", "Australia/Sydney"))
+    s_dt_utc = _coerce_datetime_series(out, tz_name=sessions_tz)
     if s_dt_utc is None:
         out["Session Norm"] = None
         if "DayName" not in out.columns:
             out["DayName"] = None
-        return out
-
-    out["__ts_utc"] = s_dt_utc
+        return
 
     # Classify using market-local clocks (DST-safe)
-    out["Session Norm"] = out["__ts_utc"].map(_classify_session_market_local)
+    out["Session Norm"] = _classify_sessions_vectorized(s_dt_utc)
 
     # DayName in local user zone (Australia/Sydney default, DST-aware)
     try:
-        local_tz = ZoneInfo(os.getenv("EDGE_LOCAL_TZ", "Australia/Sydney"))
-        out["DayName"] = out["__ts_utc"].dt.tz_convert(local_tz).dt.day_name()
+        local_tz = _tz(local_tz_name)
+        out["DayName"] = s_dt_utc.dt.tz_convert(local_tz).dt.day_name()
     except Exception:
-        out["DayName"] = out["__ts_utc"].dt.day_name()  # fallback UTC
-
-    return out.drop(columns=["__ts_utc"])
+        out["DayName"] = s_dt_utc.dt.day_name()  # fallback UTC
 
 
 # ---- Completion-aware helpers (non-breaking) --------------------------------
+def _frame_fingerprint(d: pd.DataFrame) -> str:
+    """
+    Cheap cache key for a DataFrame (Streamlit would otherwise pickle it):
+    shape, column names, and a row hash of the index and every column.
+    List-valued columns (e.g. Entry Models List) are hashed via their str().
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((d.shape, tuple(map(str, d.columns)))).encode())
+    h.update(pd.util.hash_pandas_object(d.index).values.tobytes())
+    for i in range(d.shape[1]):
+        col = d.iloc[:, i]
+        try:
+            hv = pd.util.hash_pandas_object(col, index=False)
+        except TypeError:
+            hv = pd.util.hash_pandas_object(col.astype(str), index=False)
+        h.update(hv.values.tobytes())
+    return h.hexdigest()
+
+
+def _tab_cache(name: str, key, compute):
+    """
+    Per-session memo for a tab's aggregate: reruns triggered by another tab's
+    widget reuse the stored result as long as the input fingerprint matches.
+    With key=None it simply computes.
+    """
+    if key is None:
+        return compute()
+    ss = st.session_state
+    if ss.get(f"_tab_{name}_key") != key:
+        ss[f"_tab_{name}_result"] = compute()
+        ss[f"_tab_{name}_key"] = key
+    return ss[f"_tab_{name}_result"]
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _prep_perf_df_for(key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """_prep_perf_df memoized on a precomputed _frame_fingerprint(_df)."""
+    return _prep_perf_df(_df)
+
+
+def _as_category(s: pd.Series, levels: list) -> pd.Series:
+    """Categorical with the known levels first, then any other observed labels."""
+    extra = sorted(set(s.dropna().astype(str)) - set(levels))
+    return s.astype(pd.CategoricalDtype(list(levels) + extra))
+
+
 def _prep_perf_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     For performance tabs: use only complete trades when available,
@@ -286,11 +484,12 @@ def _prep_perf_df(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
 
-    out = df.copy()
-
-    # 1) Filter to complete rows if that flag exists
-    if "Is Complete" in out.columns:
-        out = out[out["Is Complete"] == True].copy()
+    # 1) Filter to complete rows if that flag exists (copying only those rows).
+    #    app.py already passes the complete slice; this keeps other callers safe.
+    if "Is Complete" in df.columns and not df["Is Complete"].all():
+        out = df[df["Is Complete"] == True]
+    else:
+        out = df.copy()
 
     # 2) Prefer canonical outcome but keep column name 'Outcome'
     if "Outcome Canonical" in out.columns:
@@ -300,24 +499,95 @@ def _prep_perf_df(df: pd.DataFrame) -> pd.DataFrame:
             mask_bad = ~out["Outcome"].isin(["Win", "BE", "Loss"])
             out.loc[mask_bad, "Outcome"] = out.loc[mask_bad, "Outcome Canonical"]
 
-    # 3) Prefer numeric RR but keep column name 'Closed RR'
+    # 3) Prefer numeric RR but keep column name 'Closed RR'. The merged column
+    #    is stored numeric so the tabs never have to re-coerce it.
     if "Closed RR Num" in out.columns:
         if "Closed RR" not in out.columns:
             out["Closed RR"] = out["Closed RR Num"]
         else:
-            mask_nan = out["Closed RR"].isna()
-            out.loc[mask_nan, "Closed RR"] = out["Closed RR Num"]
+            raw = out["Closed RR"]
+            out["Closed RR"] = _as_numeric(raw).mask(raw.isna(), _as_numeric(out["Closed RR Num"]))
 
-    # 4) Ensure Session Norm + DayName derived (now template-driven when Session exists)
+    # 4) Session Norm + DayName (template-driven when Session exists), Entry
+    #    Models List and Instrument, derived in one normalisation pass
+    out = _normalize_frame(out)
+
+    # 5) Low-cardinality labels as categoricals so the per-tab isin/eq scans
+    #    compare int codes instead of Python strings
+    if "Outcome" in out.columns:
+        out["Outcome"] = _as_category(out["Outcome"], _OUTCOME_LEVELS + ["Unknown"])
+    if "Instrument" in out.columns:
+        out["Instrument"] = out["Instrument"].astype("category")
+    for col, levels in (("Session Norm", _SESSION_LEVELS), ("DayName", _DAY_LEVELS)):
+        if col in out.columns:
+            out[col] = _as_category(out[col], levels)
+    for col in ("Gap Alignment", "Targeted RR", "Conditions ETF", "Conditions HTF"):
+        if col in out.columns:
+            try:
+                out[col] = out[col].astype("category")
+            except TypeError:
+                pass  # multi-select (list) cells are unhashable; keep as-is
+    # Remaining plain-text object columns (Timeframe, Entry Confluence, DIV /
+    # Sweep, ...) move to Arrow strings; list-holding columns stay object
+    if _STR_DTYPE is not None:
+        for col in out.columns[out.dtypes == object]:
+            if pd.api.types.infer_dtype(out[col], skipna=True) == "string":
+                out[col] = out[col].astype(_STR_DTYPE)
+
+    # 6) Parsed date + Day/Week/Month buckets for the Growth tab, so changing
+    #    the bucket widget is a column lookup rather than a re-parse
     try:
-        out = _ensure_session_and_day(out)
+        out = _add_date_buckets(out)
     except Exception:
-        # fail-safe: keep going without sessions/days
         pass
 
     return out
 
 
+def _find_date_col(df: pd.DataFrame):
+    return _date_col_for(tuple(df.columns))
+
+
+@functools.lru_cache(maxsize=32)
+def _date_col_for(columns: tuple):
+    """'Date' if present, else the first column whose name mentions date/time."""
+    if "Date" in columns:
+        return "Date"
+    for c in columns:
+        cl = str(c).strip().lower()
+        if "date" in cl or "time" in cl:
+            return c
+    return None
+
+
+def _add_date_buckets(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add '__Date' (tz-naive) and '__Bucket_D' / '__Bucket_W' / '__Bucket_M'
+    (day, Monday week start, month start). Rows that don't parse stay NaT.
+    The source column name is kept in df.attrs["date_col"] for debugging.
+    """
+    date_col = _find_date_col(df)
+    if date_col is None:
+        return df
+
+    # Drop a trailing "(GMT+..)" label with a plain split (no regex engine);
+    # "string" dtype keeps missing cells as NA instead of "nan"/"None" text
+    d = df[date_col].astype("string").str.split("(GMT", n=1, regex=False).str[0].str.rstrip()
+    d = _to_datetime_iso_first(d)
+    if getattr(d.dt, "tz", None) is not None:
+        d = d.dt.tz_localize(None)
+
+    out = df.assign(
+        __Date=d,
+        __Bucket_D=d.dt.floor("D"),
+        # W-SUN periods run Monday..Sunday, matching resample("W-MON", closed="left")
+        __Bucket_W=d.dt.to_period("W-SUN").dt.start_time,
+        __Bucket_M=d.dt.to_period("M").dt.start_time,
+    )
+    out.attrs["date_col"] = date_col
+    return out
+
+
 def outcome_rates_from(df):
     if df.empty or "Outcome" not in df.columns:
         return dict(
@@ -330,16 +600,36 @@ def outcome_rates_from(df):
             be_rate=0.0,
             loss_rate=0.0,
         )
-    counted = df[df["Outcome"].isin(["Win", "BE", "Loss"])]
-    counted_n = len(counted)
-    wins = int(counted["Outcome"].eq("Win").sum())
-    bes = int(counted["Outcome"].eq("BE").sum())
-    losses = int(counted["Outcome"].eq("Loss").sum())
+    return _rates_from_codes(_outcome_codes(df["Outcome"]))
+
+
+def _outcome_codes(col: pd.Series) -> np.ndarray:
+    """Win/BE/Loss as int8 codes 0/1/2, anything else -1."""
+    # int8 codes hash and compare by value, unlike an object array
+    if isinstance(col.dtype, pd.CategoricalDtype) and list(col.cat.categories[:3]) == _OUTCOME_LEVELS:
+        # perf frames (_as_category) already lead with Win/BE/Loss: reuse their
+        # codes and fold every other label into -1 instead of re-encoding strings
+        codes = col.cat.codes.to_numpy()
+        return np.where(codes < 3, codes, -1).astype(np.int8)
+    return pd.Categorical(col, categories=_OUTCOME_LEVELS).codes
+
+
+def _counted_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows whose Outcome is Win/BE/Loss, via one integer compare on the codes."""
+    return df[_outcome_codes(df["Outcome"]) >= 0]
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _rates_from_codes(codes: np.ndarray) -> dict:
+    """outcome_rates_from on Win/BE/Loss category codes, memoized across tabs."""
+    # One counting pass; shift so "other" (-1) lands in bin 0
+    _, wins, bes, losses = (int(n) for n in np.bincount(codes.astype(np.intp) + 1, minlength=4)[:4])
+    counted_n = wins + bes + losses
     wr = round((wins / max(1, counted_n)) * 100.0, 2)
     br = round((bes / max(1, counted_n)) * 100.0, 2)
     lr = round((losses / max(1, counted_n)) * 100.0, 2)
     return dict(
-        total=len(df),
+        total=len(codes),
         counted=counted_n,
         wins=wins,
         bes=bes,
@@ -350,6 +640,19 @@ def outcome_rates_from(df):
     )
 
 
+def _as_numeric(s: pd.Series) -> pd.Series:
+    """pd.to_numeric(errors="coerce"), skipped when the column is already numeric."""
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s
+    return pd.to_numeric(s, errors="coerce")
+
+
+def _present_labels(col: pd.Series):
+    """Stripped string labels plus a mask of the rows whose label is not blank."""
+    s = col.astype(str).str.strip()
+    return s, s.notna() & ~s.isin(_BLANKS)
+
+
 def _rr_stats(df: pd.DataFrame):
     """
     Helper for performance tables:
@@ -357,8 +660,7 @@ def _rr_stats(df: pd.DataFrame):
     """
     if df is None or df.empty or "Closed RR" not in df.columns:
         return (None, None)
-    rr = pd.to_numeric(df["Closed RR"], errors="coerce")
-    rr = rr.dropna()
+    rr = _as_numeric(df["Closed RR"]).dropna()
     if rr.empty:
         return (None, None)
     net = float(rr.sum())
@@ -366,6 +668,71 @@ def _rr_stats(df: pd.DataFrame):
     return (net, ex)
 
 
+def _outcome_breakdown(
+    counted: pd.DataFrame, by, label: str | None, dropna: bool = True, sort: bool = True
+) -> pd.DataFrame:
+    """
+    Per-group Trades / Win % / BE % / Loss % / Net PnL (R) / Expectancy (R)
+    from a single grouping pass. Expects rows already limited to Win/BE/Loss outcomes.
+    Shared by every performance tab.
+
+    `by` is one column (its labels land in `label` as strings) or a list of
+    columns, which come back as-is under their own names. Callers that
+    re-sort the table themselves pass sort=False to skip ordering the keys.
+    """
+    multi = isinstance(by, list)
+    stats = ["Trades", "Win %", "BE %", "Loss %", "Net PnL (R)", "Expectancy (R)"]
+    cols = (by if multi else [label]) + stats
+    if counted is None or counted.empty:
+        return pd.DataFrame(columns=cols)
+
+    keys = [counted[c] for c in by] if multi else [counted[by]]
+    # only labels that actually occur become rows
+    keys = [
+        k.cat.remove_unused_categories() if isinstance(k.dtype, pd.CategoricalDtype) else k
+        for k in keys
+    ]
+
+    # Group ids from one grouping, then every stat comes out of flat
+    # bincounts over the int8 outcome codes and the float RR column
+    grouped = counted.groupby(keys if multi else keys[0], observed=True, sort=sort, dropna=dropna)
+    totals = grouped.size()
+    n = len(totals)
+    gid = grouped.ngroup().fillna(-1).to_numpy(dtype=np.intp)
+    codes = _outcome_codes(counted["Outcome"])
+    keep = (gid >= 0) & (codes >= 0)  # -1: dropped NaN key / other outcome
+    counts = np.bincount(gid[keep] * 3 + codes[keep], minlength=3 * n).reshape(n, 3)
+    trades = totals.to_numpy()
+    pct = np.round(counts / np.maximum(trades, 1)[:, None] * 100.0, 2)
+
+    if "Closed RR" in counted.columns:
+        rr = _as_numeric(counted["Closed RR"]).to_numpy(dtype=float, na_value=np.nan)
+        has = (gid >= 0) & ~np.isnan(rr)
+        rr_n = np.bincount(gid[has], minlength=n)
+        rr_sum = np.bincount(gid[has], weights=rr[has], minlength=n)
+        net = np.where(rr_n > 0, rr_sum, np.nan)
+        ex = np.divide(rr_sum, rr_n, out=np.full(n, np.nan), where=rr_n > 0)
+    else:
+        net = ex = None
+
+    if multi:
+        labels = {c: totals.index.get_level_values(i).to_numpy() for i, c in enumerate(by)}
+    else:
+        labels = {label: totals.index.astype(str)}
+    return pd.DataFrame(
+        {
+            **labels,
+            "Trades": trades,
+            "Win %": pct[:, 0],
+            "BE %": pct[:, 1],
+            "Loss %": pct[:, 2],
+            "Net PnL (R)": net,
+            "Expectancy (R)": ex,
+        },
+        columns=cols,
+    )
+
+
 def generate_overall_stats(df: pd.DataFrame):
     if df.empty:
         return dict(
@@ -413,23 +780,71 @@ def generate_overall_stats(df: pd.DataFrame):
 
 
 def _to_alt_values(df: pd.DataFrame):
+    """
+    JSON-safe list-of-records for Vega-Lite. Each column is converted once as
+    a whole array and the records are zipped together, so there is no
+    intermediate frame and no DataFrame.to_dict pass.
+    """
     if df is None or len(df) == 0:
         return []
-    d = df.reset_index(drop=True).copy()
-    for c in d.columns:
-        col = d[c]
+    names = list(df.columns)
+    cols = []
+    for c in names:
+        col = df[c]
         if pd.api.types.is_datetime64_any_dtype(col):
-            tmp = pd.to_datetime(col, errors="coerce")
-            if getattr(tmp.dt, "tz", None) is not None:
-                tmp = tmp.dt.tz_localize(None)
-            d[c] = tmp.dt.to_pydatetime()
-        elif pd.api.types.is_integer_dtype(col):
-            d[c] = col.apply(lambda v: None if pd.isna(v) else int(v))
-        elif pd.api.types.is_float_dtype(col):
-            d[c] = col.apply(lambda v: None if pd.isna(v) else float(v))
+            if getattr(col.dt, "tz", None) is not None:
+                col = col.dt.tz_localize(None)
+            # datetime64[us] -> object yields datetime.datetime (NaT -> None) in one pass
+            cols.append(col.to_numpy(dtype="datetime64[us]").astype(object).tolist())
+        elif pd.api.types.is_integer_dtype(col) or pd.api.types.is_float_dtype(col):
+            arr = col.to_numpy(dtype=object)
+            cols.append(np.where(pd.isna(arr), None, arr).tolist())
         else:
-            d[c] = col.astype(object)
-    return d.to_dict(orient="records")
+            cols.append(col.astype(object).tolist())
+    return [dict(zip(names, row)) for row in zip(*cols)]
+
+
+def _decimate(df: pd.DataFrame, n_target: int = 500) -> pd.DataFrame:
+    """
+    Evenly thin a time-ordered series to at most ~n_target rows before it is
+    serialized for Vega. First and last rows are always kept so the latest
+    value shown under the charts is unchanged.
+    """
+    if df is None or len(df) <= n_target:
+        return df
+    n = len(df)
+    idx = np.unique(np.linspace(0, n - 1, n_target).round().astype(np.intp))
+    return df.iloc[idx]
+
+
+def _is_sequence_mask(vals: np.ndarray) -> np.ndarray:
+    """Boolean mask of object-array cells holding a list/tuple."""
+    return np.fromiter((isinstance(v, (list, tuple)) for v in vals), dtype=bool, count=len(vals))
+
+
+def _split_model_text(text: pd.Series) -> list:
+    """
+    Split stripped, NA-free model strings on the list delimiters into lists of
+    non-empty, stripped parts. The split runs in a vectorised string kernel
+    (Polars for very large columns when installed, else pandas).
+    """
+    if pl is not None and len(text) >= _POLARS_MIN_ROWS:
+        try:
+            part = pl.element().str.strip_chars()
+            return (
+                pl.Series("models", text.tolist(), dtype=pl.Utf8)
+                .str.replace_all(r"[;/|+]", ",")
+                .str.split(",")
+                .list.eval(part.filter(part != ""))
+                .to_list()
+            )
+        except Exception:
+            pass  # older Polars / odd input: fall through to pandas
+    pieces = text.str.translate(_DELIM_TRANS).str.split(",")
+    return [
+        [p.strip() for p in parts if p.strip()] if t else []
+        for t, parts in zip(text.to_numpy(dtype=object), pieces.to_numpy(dtype=object))
+    ]
 
 
 # NEW: normalize "Entry Models List" across templates
@@ -439,48 +854,47 @@ def _ensure_entry_models_list(df: pd.DataFrame) -> pd.DataFrame:
     Accepts alternate columns like 'Entry Model' or 'Entry Models' and splits
     on common delimiters: comma, semicolon, slash, pipe, plus.
     """
-    if df is None or df.empty:
-        return df
+    return _normalize_frame(df, want_sessions=False, want_instrument=False)
 
-    out = df.copy()
 
+def _fill_entry_models_list(out: pd.DataFrame, lower_map: dict) -> None:
+    """In-place body of _ensure_entry_models_list."""
     if "Entry Models List" in out.columns:
-
-        def _coerce_to_list(v):
-            if isinstance(v, (list, tuple)):
-                return list(v)
-            if pd.isna(v) or v == "":
-                return []
-            return [str(v)]
-
-        out["Entry Models List"] = out["Entry Models List"].apply(_coerce_to_list)
-        return out
+        vals = out["Entry Models List"].to_numpy(dtype=object)
+        is_seq = _is_sequence_mask(vals)
+        if is_seq.all():
+            out["Entry Models List"] = [list(v) for v in vals]
+            return
+        text = out["Entry Models List"].mask(is_seq).astype("string").fillna("")
+        out["Entry Models List"] = [
+            list(v) if seq else ([t] if t else [])
+            for v, seq, t in zip(vals, is_seq, text.to_numpy(dtype=object))
+        ]
+        return
 
     # Try alternate source columns
-    lower_map = {str(c).strip().lower(): c for c in out.columns}
     alt_col = None
     for key in ("entry models", "entry model", "entry models list"):
         if key in lower_map:
             alt_col = lower_map[key]
             break
 
-    def _split_models(x):
-        if isinstance(x, (list, tuple)):
-            return [str(i).strip() for i in x if str(i).strip()]
-        if pd.isna(x):
-            return []
-        s = str(x)
-        parts = [p.strip() for p in re.split(r"[;,/|+]", s) if p.strip()]
-        return parts if parts else ([] if s.strip() == "" else [s.strip()])
-
     if alt_col:
-        out["Entry Models List"] = out[alt_col].apply(_split_models)
+        src = out[alt_col]
+        vals = src.to_numpy(dtype=object)
+        is_seq = _is_sequence_mask(vals)
+        text = src.mask(is_seq).astype("string").str.strip().fillna("")
+        models = []
+        for v, seq, t, items in zip(vals, is_seq, text.to_numpy(dtype=object), _split_model_text(text)):
+            if seq:
+                models.append([i for i in (str(x).strip() for x in v) if i])
+            else:
+                models.append(items if items or not t else [t])
+        out["Entry Models List"] = models
     else:
         # no usable column; create empty lists to avoid KeyError downstream
         out["Entry Models List"] = [[] for _ in range(len(out))]
 
-    return out
-
 
 # NEW: normalize/derive 'Instrument' across templates
 def _ensure_instrument_column(df: pd.DataFrame) -> pd.DataFrame:
@@ -488,12 +902,11 @@ def _ensure_instrument_column(df: pd.DataFrame) -> pd.DataFrame:
     Ensure there's an 'Instrument' column by copying/deriving it from common
     alternates like Pair, Symbol, Ticker, Market, Asset.
     """
-    if df is None or df.empty:
-        return df
-    out = df.copy()
+    return _normalize_frame(df, want_sessions=False, want_models=False)
 
-    lower_map = {str(c).strip().lower(): c for c in out.columns}
 
+def _fill_instrument_column(out: pd.DataFrame, lower_map: dict) -> None:
+    """In-place body of _ensure_instrument_column."""
     def pick(*names):
         for n in names:
             if n in lower_map:
@@ -505,566 +918,446 @@ def _ensure_instrument_column(df: pd.DataFrame) -> pd.DataFrame:
         alt = pick("pair", "symbol", "ticker", "market", "asset")
         if alt is not None:
             mask = out["Instrument"].isna() | (out["Instrument"].astype(str).str.strip() == "")
+            if mask.any() and isinstance(out["Instrument"].dtype, pd.CategoricalDtype):
+                out["Instrument"] = out["Instrument"].astype(object)
             out.loc[mask, "Instrument"] = out.loc[mask, alt]
-        return out
+        return
 
     # Otherwise create it from the first available alternate
     alt = pick("instrument", "pair", "symbol", "ticker", "market", "asset")
     if alt is not None:
         out["Instrument"] = out[alt]
     # If none found, we just return without Instrument; caller must handle
-    return out
 
 
-# ───────────────────────────── Growth (FIXED DATE HANDLING) ──────────────────
-def _growth_tab(f: pd.DataFrame, df_all: pd.DataFrame, styler):
+def _normalize_frame(
+    df: pd.DataFrame,
+    *,
+    want_sessions: bool = True,
+    want_models: bool = True,
+    want_instrument: bool = True,
+) -> pd.DataFrame:
     """
-    FIXED: Proper datetime resampling for Day/Week/Month buckets.
-    No more duplicate labels or misaligned dates.
+    Fused _ensure_session_and_day / _ensure_entry_models_list /
+    _ensure_instrument_column: one (shallow) copy and one column-name scan
+    for whichever of the three steps are requested.
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
+    if df is None or df.empty:
+        return df
+    out = df.copy(deep=False)
+    lower_map = {str(c).strip().lower(): c for c in out.columns}
 
-    # Use ONLY the complete slice (already filtered in app.py)
-    if f is None or f.empty:
-        st.info("No dated rows yet. Add some trades or adjust filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+    if want_sessions:
+        try:
+            staged = out.copy(deep=False)
+            _fill_session_and_day(staged)
+            out = staged
+        except Exception:
+            # fail-safe: keep going without sessions/days
+            pass
+    if want_models:
+        _fill_entry_models_list(out, lower_map)
+    if want_instrument:
+        _fill_instrument_column(out, lower_map)
+    return out
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _ensure_entry_models_list_for(key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """_ensure_entry_models_list memoized on a precomputed _frame_fingerprint(_df)."""
+    return _ensure_entry_models_list(_df)
 
-    g = f.copy()
 
-    # --- Find a usable date column ---
-    date_col = None
-    if "Date" in g.columns:
-        date_col = "Date"
+@st.cache_data(show_spinner=False, max_entries=4)
+def _ensure_instrument_column_for(key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """_ensure_instrument_column memoized on a precomputed _frame_fingerprint(_df)."""
+    return _ensure_instrument_column(_df)
+
+
+# ───────────────────────────── Growth (FIXED DATE HANDLING) ──────────────────
+# Vega-Lite layer templates for the growth charts; data and x encoding are
+# filled in per render and passed straight to st.vega_lite_chart (no Altair
+# object construction/validation on every rerun).
+_PNL_AREA_MARK = {"type": "area", "opacity": 0.12, "color": "#4800ff"}
+_PNL_LINE_MARK = {"type": "line", "strokeWidth": 2, "color": "#4800ff", "interpolate": "linear"}
+_PNL_Y = {"field": "CumPnL", "type": "quantitative", "title": "Cumulative PnL (RR)"}
+_WR_Y = {
+    "field": "Win %",
+    "type": "quantitative",
+    "title": "Win Rate (%)",
+    "scale": {"domain": [0, 100]},
+}
+_VEGA_CONFIG = get_vega_config()
+
+# Time Bucket choice -> (precomputed bucket column, gap-fill freq, axis format)
+_GROWTH_BUCKETS = {
+    "Day": ("__Bucket_D", None, "%b %d"),
+    "Week": ("__Bucket_W", "W-MON", "%b %d"),
+    "Month": ("__Bucket_M", "MS", "%b %Y"),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _x_time(bucket: str) -> dict:
+    """
+    Temporal x encoding for the growth charts (shared, treat as read-only).
+    Uses labelOverlap to automatically hide crowded labels.
+    """
+    axis_fmt = _GROWTH_BUCKETS[bucket][2]
+    if bucket == "Week":
+        # For weekly: angle labels
+        axis = {"format": axis_fmt, "labelAngle": -45, "labelLimit": 200, "labelOverlap": True}
+        scale = {"nice": False, "padding": 0.05}
     else:
-        for c in g.columns:
-            cl = str(c).strip().lower()
-            if cl == "date" or "date" in cl or "time" in cl:
-                date_col = c
-                break
-
-    if not date_col:
-        st.warning("No date-like column found in complete trades.")
-        st.info("No dated rows yet. Add some trades or adjust filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        # For daily/monthly: horizontal
+        axis = {"format": axis_fmt, "labelAngle": 0, "labelLimit": 140, "labelOverlap": True}
+        scale = {"nice": False, "padding": 0}
+    return {"field": "Bucket", "type": "temporal", "title": None, "axis": axis, "scale": scale}
 
-    # --- Coerce to real datetimes ---
-    g["__Date"] = g[date_col].astype(str).str.replace(r"\s*\(GMT.*\)$", "", regex=True)
-    g["__Date"] = pd.to_datetime(g["__Date"], errors="coerce")
 
-    # Drop NaT
-    g = g[g["__Date"].notna()].copy()
-    if g.empty:
-        with st.expander("Debug: date parsing", expanded=False):
-            try:
-                st.write("Sample raw values:", f[date_col].head(5).tolist())
-            except Exception:
-                pass
-        st.info("No dated rows yet. Add some trades or adjust filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+def _fill_buckets(agg, freq):
+    """Reindex a per-bucket aggregate onto a continuous range, zero-filling gaps."""
+    if freq is None or len(agg) == 0:
+        return agg
+    full = pd.date_range(agg.index.min(), agg.index.max(), freq=freq)
+    return agg.reindex(full, fill_value=0)
 
-    # Remove timezone to get clean naive datetime
-    try:
-        if getattr(g["__Date"].dt, "tz", None) is not None:
-            g["__Date"] = g["__Date"].dt.tz_localize(None)
-    except Exception:
-        pass
 
-    # Ensure PnL_from_RR exists (prefer numeric RR if present)
-    if "PnL_from_RR" not in g.columns:
+def _growth_values(g: pd.DataFrame, bucket: str):
+    """
+    Chart records for the growth tab: (cumulative PnL values, cumulative
+    Win % values), both decimated and JSON-safe. g holds only dated rows.
+    """
+    # PnL_from_RR if present, else derive it (prefer numeric RR) without
+    # adding a column to g
+    if "PnL_from_RR" in g.columns:
+        pnl = g["PnL_from_RR"]
+    else:
         rr_col = "Closed RR Num" if "Closed RR Num" in g.columns else "Closed RR"
-        g["PnL_from_RR"] = g.get(rr_col, 0.0).fillna(0.0)
-
-    # Controls (only Time Bucket now; Win Rate Mode is always cumulative)
-    c1, _, _ = st.columns([1, 1, 2])
-    with c1:
-        bucket = st.selectbox(
-            "Time Bucket",
-            ["Day", "Week", "Month"],
-            index=1,
-            key="growth_bucket",
-        )
-
-    # Sort by date
-    g = g.sort_values("__Date").copy()
+        if rr_col in g.columns:
+            arr = np.nan_to_num(g[rr_col].to_numpy(dtype=np.float32, na_value=np.nan), nan=0.0)
+        else:
+            arr = np.zeros(len(g), dtype=np.float32)
+        pnl = pd.Series(arr, index=g.index)
 
-    # FIXED: Set datetime index for proper resampling
-    g_indexed = g.set_index("__Date")
+    bucket_col, fill_freq, _ = _GROWTH_BUCKETS[bucket]
 
-    # FIXED: Resample based on bucket type - use pandas resample for proper datetime handling
-    if bucket == "Day":
-        # Daily: group by date (no resampling needed, already daily)
-        eq_df = (
-            g_indexed.groupby(g_indexed.index.date)["PnL_from_RR"]
-            .sum()
-            .reset_index()
-        )
-        # Rename the grouped column to "Bucket"
-        eq_df.columns = ["Bucket", "PnLBucket"]
-        # Convert date back to datetime for consistent handling
-        eq_df["Bucket"] = pd.to_datetime(eq_df["Bucket"])
-        axis_fmt = "%b %d"
-    elif bucket == "Week":
-        # Weekly: resample to week start (Monday)
-        eq_df = (
-            g_indexed["PnL_from_RR"]
-            .resample("W-MON", label="left", closed="left")
-            .sum()
-            .reset_index()
-        )
-        eq_df.columns = ["Bucket", "PnLBucket"]
-        axis_fmt = "%b %d"
-    else:  # Month
-        # Monthly: resample to month start
-        eq_df = (
-            g_indexed["PnL_from_RR"]
-            .resample("MS")
-            .sum()
-            .reset_index()
-        )
-        eq_df.columns = ["Bucket", "PnLBucket"]
-        axis_fmt = "%b %Y"
+    # Sum per bucket; Week/Month also get empty buckets (as resample would)
+    eq = pnl.groupby(g[bucket_col], observed=True).sum()
+    eq_df = _fill_buckets(eq, fill_freq).rename_axis("Bucket").reset_index(name="PnLBucket")
 
     # Calculate cumulative PnL
     eq_df["CumPnL"] = eq_df["PnLBucket"].fillna(0).cumsum()
 
-    # Prepare Altair data with proper datetime types
-    # Use labelOverlap to automatically hide crowded labels
-    if bucket == "Week":
-        # For weekly: angle labels
-        x_time = alt.X(
-            "Bucket:T",
-            title=None,
-            axis=alt.Axis(
-                format=axis_fmt,
-                labelAngle=-45,
-                labelLimit=200,
-                labelOverlap=True,  # Auto-hide overlapping labels
-            ),
-            scale=alt.Scale(nice=False, padding=0.05),
-        )
-    elif bucket == "Month":
-        # For monthly: horizontal
-        x_time = alt.X(
-            "Bucket:T",
-            title=None,
-            axis=alt.Axis(
-                format=axis_fmt,
-                labelAngle=0,
-                labelLimit=140,
-                labelOverlap=True,  # Auto-hide overlapping labels
-            ),
-            scale=alt.Scale(nice=False, padding=0),
-        )
-    else:
-        # For daily: automatic label thinning
-        x_time = alt.X(
-            "Bucket:T",
-            title=None,
-            axis=alt.Axis(
-                format=axis_fmt,
-                labelAngle=0,
-                labelLimit=140,
-                labelOverlap=True,
-            ),
-            scale=alt.Scale(nice=False, padding=0),
-        )
-    pnl_vals = _to_alt_values(eq_df[["Bucket", "CumPnL"]])
+    pnl_vals = _to_alt_values(_decimate(eq_df[["Bucket", "CumPnL"]]))
 
     # FIXED: Win rate calculation (always cumulative) with proper resampling
-    wr = g[["__Date", "Outcome"]].dropna()
-    wr = wr[wr["Outcome"].isin(["Win", "BE", "Loss"])]
+    wr = g[[bucket_col, "Outcome"]].dropna()
+    wr = _counted_rows(wr)
     wr_vals = []
     if not wr.empty:
-        # Create indexed version for resampling
-        wr_indexed = wr.set_index("__Date")
-
-        # Resample win rate data to match bucket type
-        if bucket == "Day":
-            wr_grouped = (
-                wr_indexed.groupby(wr_indexed.index.date)
-                .agg(
-                    trades=("Outcome", "count"),
-                    wins=("Outcome", lambda s: (s == "Win").sum()),
-                )
-                .reset_index()
-            )
-            wr_grouped.columns = ["Bucket", "trades", "wins"]
-            wr_grouped["Bucket"] = pd.to_datetime(wr_grouped["Bucket"])
-        elif bucket == "Week":
-            wr_grouped = (
-                wr_indexed.resample("W-MON", label="left", closed="left")
-                .agg(
-                    trades=("Outcome", "count"),
-                    wins=("Outcome", lambda s: (s == "Win").sum()),
-                )
-                .reset_index()
-            )
-            wr_grouped.columns = ["Bucket", "trades", "wins"]
-        else:  # Month
-            wr_grouped = (
-                wr_indexed.resample("MS")
-                .agg(
-                    trades=("Outcome", "count"),
-                    wins=("Outcome", lambda s: (s == "Win").sum()),
-                )
-                .reset_index()
-            )
-            wr_grouped.columns = ["Bucket", "trades", "wins"]
-
-        # Calculate cumulative win rate
-        wr_grouped["CumTrades"] = wr_grouped["trades"].cumsum()
-        wr_grouped["CumWins"] = wr_grouped["wins"].cumsum()
-        wr_grouped["Win %"] = np.where(
-            wr_grouped["CumTrades"] > 0,
-            (wr_grouped["CumWins"] / wr_grouped["CumTrades"]) * 100.0,
-            0.0,
+        # Cumulative win rate in a few NumPy passes: sort by bucket, per-bucket
+        # trade/win counts via reduceat, then running totals
+        b = wr[bucket_col].to_numpy(dtype="datetime64[ns]")
+        wins = wr["Outcome"].eq("Win").to_numpy(dtype=np.int64)
+        order = np.argsort(b, kind="stable")
+        b, wins = b[order], wins[order]
+        buckets, starts = np.unique(b, return_index=True)
+        cum_trades = np.add.reduceat(np.ones_like(wins), starts).cumsum()
+        cum_wins = np.add.reduceat(wins, starts).cumsum()
+        if fill_freq is not None:
+            # Empty Week/Month buckets carry the running totals forward
+            full = pd.date_range(buckets[0], buckets[-1], freq=fill_freq).to_numpy(dtype="datetime64[ns]")
+            pos = np.searchsorted(buckets, full, side="right") - 1
+            buckets, cum_trades, cum_wins = full, cum_trades[pos], cum_wins[pos]
+        wr_plot = pd.DataFrame(
+            {
+                "Bucket": buckets,
+                "Win %": np.round(cum_wins / np.maximum(cum_trades, 1) * 100.0, 2),
+            }
         )
-        wr_plot = wr_grouped[["Bucket", "Win %"]].copy()
-        wr_plot["Win %"] = wr_plot["Win %"].round(2)
-        wr_vals = _to_alt_values(wr_plot[["Bucket", "Win %"]])
-
-    # Charts
-    c_left, c_right = st.columns(2)
-    with c_left:
-        st.markdown("### Cumulative PnL (RR)")
-        if pnl_vals:
-            area = (
-                alt.Chart(alt.Data(values=pnl_vals))
-                .mark_area(opacity=0.12, color="#4800ff")
-                .encode(
-                    x=x_time,
-                    y=alt.Y("CumPnL:Q", title="Cumulative PnL (RR)"),
-                )
-            )
-            line = (
-                alt.Chart(alt.Data(values=pnl_vals))
-                .mark_line(strokeWidth=2, color="#4800ff", interpolate="linear")
-                .encode(x=x_time, y="CumPnL:Q")
-            )
-            st.altair_chart(
-                styler(alt.layer(area, line).properties(height=320)),
-                use_container_width=True,
-            )
-        else:
-            st.info("Not enough data for PnL chart.")
-    with c_right:
-        st.markdown("### Win Rate (%)")
-        if wr_vals:
-            line_color = (
-                "#0f172a"
-                if st.session_state.get("ui_theme", "light") == "light"
-                else "#e5e7eb"
+        wr_vals = _to_alt_values(_decimate(wr_plot))
+    return pnl_vals, wr_vals
+
+
+def _last_value(vals: list, field: str) -> float:
+    """Last non-null `field` in a list of chart records (NaN if none)."""
+    return next((float(r[field]) for r in reversed(vals) if r[field] is not None), float("nan"))
+
+
+def _growth_charts(g: pd.DataFrame, bucket: str, theme: str):
+    """
+    (PnL spec or None, Win % spec or None, latest Win %, latest cumulative PnL)
+    for the growth tab.
+    """
+    pnl_vals, wr_vals = _growth_values(g, bucket)
+    # Shared Vega-Lite x encoding for both charts
+    x_time = _x_time(bucket)
+
+    pnl_spec = None
+    if pnl_vals:
+        # x is encoded once at the top level and inherited by both layers
+        pnl_spec = {
+            "data": {"values": pnl_vals},
+            "height": 320,
+            "encoding": {"x": x_time},
+            "layer": [
+                {"mark": _PNL_AREA_MARK, "encoding": {"y": _PNL_Y}},
+                {
+                    "mark": _PNL_LINE_MARK,
+                    "encoding": {"y": {"field": "CumPnL", "type": "quantitative"}},
+                },
+            ],
+            "config": _VEGA_CONFIG,
+        }
+
+    wr_spec = None
+    if wr_vals:
+        wr_spec = {
+            "data": {"values": wr_vals},
+            "height": 320,
+            "mark": {
+                "type": "line",
+                "strokeWidth": 2,
+                "color": "#0f172a" if theme == "light" else "#e5e7eb",
+                "interpolate": "linear",
+            },
+            "encoding": {"x": x_time, "y": _WR_Y},
+            "config": _VEGA_CONFIG,
+        }
+
+    latest_wr = _last_value(wr_vals, "Win %") if wr_vals else float("nan")
+    latest_eq = _last_value(pnl_vals, "CumPnL") if pnl_vals else float("nan")
+    return pnl_spec, wr_spec, latest_wr, latest_eq
+
+
+def _growth_tab(f: pd.DataFrame, df_all: pd.DataFrame, styler, cache_key=None):
+    """
+    FIXED: Proper datetime resampling for Day/Week/Month buckets.
+    No more duplicate labels or misaligned dates.
+    """
+    with _section():
+        # Use ONLY the complete slice (already filtered in app.py)
+        if f is None or f.empty:
+            st.info("No dated rows yet. Add some trades or adjust filters.")
+            return
+
+        if "__Date" not in f.columns:
+            st.warning("No date-like column found in complete trades.")
+            st.info("No dated rows yet. Add some trades or adjust filters.")
+            return
+
+        # Dates/buckets are parsed once in _prep_perf_df; just drop NaT here
+        # (read-only from here on, so no copy)
+        g = f[f["__Date"].notna()]
+        if g.empty:
+            with st.expander("Debug: date parsing", expanded=False):
+                try:
+                    st.write("Sample raw values:", f[f.attrs["date_col"]].head(5).tolist())
+                except Exception:
+                    pass
+            st.info("No dated rows yet. Add some trades or adjust filters.")
+            return
+
+        # Controls (only Time Bucket now; Win Rate Mode is always cumulative)
+        c1, _, _ = st.columns([1, 1, 2])
+        with c1:
+            bucket = st.selectbox(
+                "Time Bucket",
+                ["Day", "Week", "Month"],
+                index=1,
+                key="growth_bucket",
             )
-            # Use labelOverlap to automatically hide crowded labels
-            if bucket == "Week":
-                # For weekly: angle labels
-                xwr = alt.X(
-                    "Bucket:T",
-                    title=None,
-                    axis=alt.Axis(
-                        format=axis_fmt,
-                        labelAngle=-45,
-                        labelLimit=200,
-                        labelOverlap=True,
-                    ),
-                    scale=alt.Scale(nice=False, padding=0.05),
-                )
-            elif bucket == "Month":
-                # For monthly: horizontal
-                xwr = alt.X(
-                    "Bucket:T",
-                    title=None,
-                    axis=alt.Axis(
-                        format=axis_fmt,
-                        labelAngle=0,
-                        labelLimit=140,
-                        labelOverlap=True,
-                    ),
-                    scale=alt.Scale(nice=False, padding=0),
-                )
+
+        # Finished Vega-Lite specs (plus footer figures) are memoized per
+        # (frame, bucket, theme); reruns caused by other widgets skip the
+        # aggregation, record building and spec assembly altogether
+        theme = st.session_state.get("ui_theme", "light")
+        growth_key = None if cache_key is None else (cache_key, bucket, theme)
+        pnl_spec, wr_spec, latest_wr, latest_eq = _tab_cache(
+            "growth", growth_key, lambda: _growth_charts(g, bucket, theme)
+        )
+
+        # Charts
+        c_left, c_right = st.columns(2)
+        with c_left:
+            st.markdown("### Cumulative PnL (RR)")
+            if pnl_spec:
+                st.vega_lite_chart(pnl_spec, use_container_width=True)
             else:
-                # For daily: automatic
-                xwr = alt.X(
-                    "Bucket:T",
-                    title=None,
-                    axis=alt.Axis(
-                        format=axis_fmt,
-                        labelAngle=0,
-                        labelLimit=140,
-                        labelOverlap=True,
-                    ),
-                    scale=alt.Scale(nice=False, padding=0),
-                )
-            line = (
-                alt.Chart(alt.Data(values=wr_vals))
-                .mark_line(
-                    strokeWidth=2,
-                    color=line_color,
-                    interpolate="linear",
-                )
-                .encode(
-                    x=xwr,
-                    y=alt.Y(
-                        "Win %:Q",
-                        title="Win Rate (%)",
-                        scale=alt.Scale(domain=[0, 100]),
-                    ),
-                )
-                .properties(height=320)
-            )
-            st.altair_chart(styler(line), use_container_width=True)
-        else:
-            st.info("Not enough data for Win Rate chart.")
+                st.info("Not enough data for PnL chart.")
+        with c_right:
+            st.markdown("### Win Rate (%)")
+            if wr_spec:
+                st.vega_lite_chart(wr_spec, use_container_width=True)
+            else:
+                st.info("Not enough data for Win Rate chart.")
 
-    latest_wr = (
-        float(pd.DataFrame(wr_vals)["Win %"].dropna().iloc[-1]) if wr_vals else float("nan")
-    )
-    latest_eq = (
-        float(pd.DataFrame(pnl_vals)["CumPnL"].dropna().iloc[-1])
-        if pnl_vals
-        else float("nan")
-    )
-    st.markdown(
-        f"<div class='muted'>Latest Win %: <b>{latest_wr:.2f}%</b> &nbsp;|&nbsp; Cumulative PnL: <b>{latest_eq:,.2f} R</b></div>",
-        unsafe_allow_html=True,
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(
+            f"<div class='muted'>Latest Win %: <b>{latest_wr:.2f}%</b> &nbsp;|&nbsp; Cumulative PnL: <b>{latest_eq:,.2f} R</b></div>",
+            unsafe_allow_html=True,
+        )
 
 
 # ------------------------------ Other tabs -----------------------------------
-def _entry_models_tab(f: pd.DataFrame, show_table):
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
+def _entry_models_summary(f: pd.DataFrame, cache_key=None):
+    """Return (entry model table, None) or (None, info message)."""
     if f is None or f.empty:
-        st.info("No trades for current filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No trades for current filters."
 
     # Ensure we have a proper list column, regardless of template
-    f_norm = _ensure_entry_models_list(f)
+    if cache_key is None:
+        f_norm = _ensure_entry_models_list(f)
+    else:
+        f_norm = _ensure_entry_models_list_for(cache_key, f)
 
     if "Entry Models List" not in f_norm.columns:
-        st.info("No entry model data.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No entry model data."
 
-    # Keep only rows that have at least one model
-    em = f_norm.copy()
-    em = em[
-        em["Entry Models List"].apply(
-            lambda x: isinstance(x, (list, tuple)) and len(x) > 0
-        )
-    ]
+    # Keep only rows that have at least one model (every cell is a list after
+    # normalisation, so the vectorised length is enough)
+    em = f_norm[f_norm["Entry Models List"].str.len().gt(0)]
     if em.empty:
-        st.info("No entry model data.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No entry model data."
 
-    # One row per model
-    em = em.explode("Entry Models List", ignore_index=True)
+    # One row per model, exploding only the columns the breakdown reads
+    slim = [c for c in ("Outcome", "Closed RR", "Entry Models List") if c in em.columns]
+    em = em[slim].explode("Entry Models List", ignore_index=True)
     em = em[em["Entry Models List"].astype(str).str.strip() != ""]
     if em.empty:
-        st.info("No entry model data.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No entry model data."
 
-    counted = em[em["Outcome"].isin(["Win", "BE", "Loss"])]
+    counted = _counted_rows(em)
     if counted.empty:
-        st.info("No counted outcomes yet.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No counted outcomes yet."
 
-    rates = []
-    for model, group in counted.groupby("Entry Models List"):
-        r = outcome_rates_from(group)
-        net_rr, ex_rr = _rr_stats(group)
-        rates.append(
-            dict(
-                Entry_Model=str(model),
-                Trades=len(group),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
-            )
-        )
+    entry_model_df = _outcome_breakdown(counted, "Entry Models List", "Entry_Model", sort=False)
+    if entry_model_df.empty:
+        return None, "No counted outcomes yet."
+    return entry_model_df.sort_values("Win %", ascending=False), None
 
-    if rates:
-        entry_model_df = pd.DataFrame(rates).sort_values("Win %", ascending=False)
-        render_entry_model_table(entry_model_df, title="Entry Model Performance")
-    else:
-        st.info("No counted outcomes yet.")
 
-    st.markdown("</div>", unsafe_allow_html=True)
+def _entry_models_tab(f: pd.DataFrame, show_table, cache_key=None):
+    with _section():
+        entry_model_df, msg = _tab_cache("entry_models", cache_key, lambda: _entry_models_summary(f, cache_key))
+        if entry_model_df is None:
+            st.info(msg)
+        else:
+            render_entry_model_table(entry_model_df, title="Entry Model Performance")
 
 
 # ---------- NEW: Confluence tab ----------------------------------------------
-def _confluences_tab(f: pd.DataFrame, show_table):
-    """
-    Confluence Performance tab:
-    - Uses DIV? and Sweep? columns (or Entry Confluence as fallback)
-    - Aggregates Trades / Win % / BE % / Loss % / Net PnL (R) / Expectancy (R) for:
-        DIV, Sweep, DIV & Sweep
-    """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty:
-        st.info("No trades for current filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = f.copy()
-
-    # ---- Figure out which columns are DIV / Sweep (robust, avoids Divergence) ---
-    lower_map = {str(c).strip().lower(): c for c in g.columns}
-
-    def _norm_name(name: str) -> str:
-        # strip everything except letters and lowercase
-        return re.sub(r"[^a-z]", "", name.lower())
-
+@functools.lru_cache(maxsize=32)
+def _confluence_cols_for(columns: tuple):
+    """(DIV column, Sweep column) by letters-only name; avoids e.g. Divergence."""
+    lower_map = {str(c).strip().lower(): c for c in columns}
     div_col_name = None
     sweep_col_name = None
     for key, col in lower_map.items():
-        norm = _norm_name(key)
+        # strip everything except letters and lowercase
+        norm = _NON_ALPHA_RE.sub("", key)
         if norm == "div" and div_col_name is None:
             div_col_name = col
         if norm == "sweep" and sweep_col_name is None:
             sweep_col_name = col
+    return div_col_name, sweep_col_name
 
-    # ---- Derive a 'Confluence' label per row --------------------------------
-    def _from_yes_no(val) -> bool:
-        if val is None:
-            return False
-        if isinstance(val, float) and pd.isna(val):
-            return False
-        s = str(val).strip().lower()
-        return s in {"yes", "y", "true", "1"}
-
-    def _classify_row(row):
-        # Primary path: separate DIV / Sweep columns (your new template)
-        if div_col_name is not None or sweep_col_name is not None:
-            div_flag = _from_yes_no(row.get(div_col_name)) if div_col_name is not None else False
-            sweep_flag = _from_yes_no(row.get(sweep_col_name)) if sweep_col_name is not None else False
-
-            if div_flag and sweep_flag:
-                return "DIV & Sweep"
-            if div_flag and not sweep_flag:
-                return "DIV"
-            if sweep_flag and not div_flag:
-                return "Sweep"
-            return None
 
-        # Fallback: single Entry Confluence-like column (old style)
-        for col_name in ["Entry Confluence", "Confluence"]:
-            if col_name in row.index:
-                v = row[col_name]
-                if isinstance(v, (list, tuple, set)):
-                    items = [str(x).strip().lower() for x in v]
-                else:
-                    s = str(v)
-                    items = [p.strip().lower() for p in re.split(r"[;,/|+]", s) if p.strip()]
-
-                has_div = any("div" in it for it in items)
-                has_sweep = any("sweep" in it for it in items)
-
-                if has_div and has_sweep:
-                    return "DIV & Sweep"
-                if has_div and not has_sweep:
-                    return "DIV"
-                if has_sweep and not has_div:
-                    return "Sweep"
-                return None
+def _confluence_summary(f: pd.DataFrame):
+    """Return (confluence table, None) or (None, info message)."""
+    if f is None or f.empty:
+        return None, "No trades for current filters."
 
-        return None
+    # shallow: only the Confluence label column is added
+    g = f.copy(deep=False)
+
+    div_col_name, sweep_col_name = _confluence_cols_for(tuple(g.columns))
+
+    # ---- Derive a 'Confluence' label per row --------------------------------
+    no_flag = pd.Series(False, index=g.index)
+
+    def _from_yes_no(col_name) -> pd.Series:
+        if col_name is None:
+            return no_flag
+        return g[col_name].astype(str).str.strip().str.lower().isin({"yes", "y", "true", "1"})
 
-    g["Confluence"] = g.apply(_classify_row, axis=1)
+    if div_col_name is not None or sweep_col_name is not None:
+        # Primary path: separate DIV / Sweep columns (your new template)
+        div_flag = _from_yes_no(div_col_name)
+        sweep_flag = _from_yes_no(sweep_col_name)
+    else:
+        # Fallback: single Entry Confluence-like column (old style)
+        col_name = next((c for c in ("Entry Confluence", "Confluence") if c in g.columns), None)
+        if col_name is None:
+            div_flag = sweep_flag = no_flag
+        else:
+            # str() of a list/tuple/set cell still contains each item's text and
+            # the delimiters never form part of "div"/"sweep", so a substring
+            # scan over the whole column matches the old per-token check
+            text = g[col_name].astype(str)
+            div_flag = text.str.contains("div", case=False, regex=False, na=False)
+            sweep_flag = text.str.contains("sweep", case=False, regex=False, na=False)
+
+    g["Confluence"] = np.select(
+        [div_flag & sweep_flag, div_flag & ~sweep_flag, sweep_flag & ~div_flag],
+        ["DIV & Sweep", "DIV", "Sweep"],
+        default=None,
+    )
     g = g[g["Confluence"].notna()]
     if g.empty:
-        st.info("No DIV / Sweep confluence data in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No DIV / Sweep confluence data in current slice."
 
     # Only counted outcomes
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
+    counted = _counted_rows(g)
     if counted.empty:
-        st.info("No counted outcomes yet for any confluence.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No counted outcomes yet for any confluence."
 
     # ---- Aggregate to DIV / Sweep / DIV & Sweep -----------------------------
-    rows = []
-    for conf in CONFLUENCE_OPTIONS:
-        sub = counted[counted["Confluence"] == conf]
-        if sub.empty:
-            continue
-        r = outcome_rates_from(sub)
-        net_rr, ex_rr = _rr_stats(sub)
-        rows.append(
-            dict(
-                Confluence=conf,
-                Trades=len(sub),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
-            )
-        )
+    conf_df = _outcome_breakdown(counted, "Confluence", "Entry_Model", sort=False)
+    if conf_df.empty:
+        return None, "No confluence stats available."
+    # Reuses the Entry Model layout via the label column name
+    return conf_df.sort_values("Win %", ascending=False).reset_index(drop=True), None
 
-    if rows:
-        conf_df = (
-            pd.DataFrame(rows)
-            .sort_values("Win %", ascending=False)
-            .reset_index(drop=True)
-        )
-        # Reuse Entry Model layout by renaming the label column
-        conf_df = conf_df.rename(columns={"Confluence": "Entry_Model"})
-        render_entry_model_table(conf_df, title="Confluence Performance")
-    else:
-        st.info("No confluence stats available.")
 
-    st.markdown("</div>", unsafe_allow_html=True)
+def _confluences_tab(f: pd.DataFrame, show_table, cache_key=None):
+    """
+    Confluence Performance tab:
+    - Uses DIV? and Sweep? columns (or Entry Confluence as fallback)
+    - Aggregates Trades / Win % / BE % / Loss % / Net PnL (R) / Expectancy (R) for:
+        DIV, Sweep, DIV & Sweep
+    """
+    with _section():
+        conf_df, msg = _tab_cache("confluence", cache_key, lambda: _confluence_summary(f))
+        if conf_df is None:
+            st.info(msg)
+        else:
+            render_entry_model_table(conf_df, title="Confluence Performance")
 
 
-def _sessions_tab(f: pd.DataFrame, show_table):
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    # Title comes from the renderer
+def _sessions_summary(f: pd.DataFrame):
+    """Return (session table, None) or (None, info message)."""
     if f.empty or "Session Norm" not in f.columns or f["Session Norm"].isna().all():
-        st.info("No session data.")
-    else:
-        counted = f[f["Outcome"].isin(["Win", "BE", "Loss"])]
-        rates = []
-        for sess, g in counted.groupby("Session Norm"):
-            r = outcome_rates_from(g)
-            net_rr, ex_rr = _rr_stats(g)
-            rates.append(
-                dict(
-                    Session=sess,
-                    Trades=len(g),
-                    **{
-                        "Win %": r["win_rate"],
-                        "BE %": r["be_rate"],
-                        "Loss %": r["loss_rate"],
-                        "Net PnL (R)": net_rr,
-                        "Expectancy (R)": ex_rr,
-                    },
-                )
-            )
-        session_df = pd.DataFrame(rates).sort_values("Win %", ascending=False)
-        render_session_performance_table(session_df, title="Session Performance")
-    st.markdown("</div>", unsafe_allow_html=True)
+        return None, "No session data."
+    counted = _counted_rows(f)
+    session_df = _outcome_breakdown(counted, "Session Norm", "Session", sort=False).sort_values(
+        "Win %", ascending=False
+    )
+    return session_df, None
+
+
+def _sessions_tab(f: pd.DataFrame, show_table, cache_key=None):
+    with _section():
+        # Title comes from the renderer
+        session_df, msg = _tab_cache("sessions", cache_key, lambda: _sessions_summary(f))
+        if session_df is None:
+            st.info(msg)
+        else:
+            render_session_performance_table(session_df, title="Session Performance")
 
 
 # ---------- NEW: Instruments tab (performance by instrument/pair) ------------
-def _instruments_tab(f: pd.DataFrame, show_table):
+def _instruments_tab(f: pd.DataFrame, show_table, cache_key=None):
     """
     Performance by instrument/pair.
 
@@ -1073,116 +1366,75 @@ def _instruments_tab(f: pd.DataFrame, show_table):
     - Computes win / BE / loss rate per instrument and shows it in the same
     card style as Entry Model Performance.
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty:
-        st.info("No trades for current filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Normalise the Instrument column (Pair / Symbol / Ticker / Market → Instrument)
-    g = _ensure_instrument_column(f)
-    if "Instrument" not in g.columns:
-        st.info(
-            "No instrument/pair column detected (Instrument/Pair/Symbol/Ticker/Market)."
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = g.copy()
-    g["Instrument"] = g["Instrument"].astype(str).str.strip()
-    g = g[g["Instrument"] != ""]
-    if g.empty:
-        st.info("No instrument values present.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Only counted outcomes
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
-    if counted.empty:
-        st.info("No counted outcomes yet for any instrument.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Build the same style table as Entry Models: Instrument | Trades | Win % | BE % | Loss % | Net PnL (R)
-    rows = []
-    for inst, g_inst in counted.groupby("Instrument"):
-        r = outcome_rates_from(g_inst)
-        net_rr, ex_rr = _rr_stats(g_inst)
-        rows.append(
-            dict(
-                Instrument=_asset_label(inst),
-                Trades=len(g_inst),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
+    with _section():
+        if f is None or f.empty:
+            st.info("No trades for current filters.")
+            return
+
+        # Normalise the Instrument column (Pair / Symbol / Ticker / Market → Instrument)
+        if cache_key is None:
+            g = _ensure_instrument_column(f)
+        else:
+            g = _ensure_instrument_column_for(cache_key, f)
+        if "Instrument" not in g.columns:
+            st.info(
+                "No instrument/pair column detected (Instrument/Pair/Symbol/Ticker/Market)."
             )
-        )
-
-    if rows:
-        instrument_df = (
-            pd.DataFrame(rows)
-            .sort_values("Win %", ascending=False)
-            .reset_index(drop=True)
-        )
+            return
+
+        g = g.copy(deep=False)
+        g["Instrument"] = g["Instrument"].astype(str).str.strip()
+        g = g[g["Instrument"] != ""]
+        if g.empty:
+            st.info("No instrument values present.")
+            return
+
+        # Only counted outcomes
+        counted = _counted_rows(g)
+        if counted.empty:
+            st.info("No counted outcomes yet for any instrument.")
+            return
+
+        # Build the same style table as Entry Models: Instrument | Trades | Win % | BE % | Loss % | Net PnL (R)
+        instrument_df = _outcome_breakdown(counted, "Instrument", "Instrument", sort=False)
+        if instrument_df.empty:
+            st.info("No instrument stats available.")
+            return
+        instrument_df["Instrument"] = _asset_labels(instrument_df["Instrument"])
+        instrument_df = instrument_df.sort_values("Win %", ascending=False).reset_index(drop=True)
         # Use the same renderer as Entry Models to match theme/colours
         render_entry_model_table(instrument_df, title="Asset Performance")
-    else:
-        st.info("No instrument stats available.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
 
 
 # ---------- Days-only (Mon–Fri), no hours/duration in this tab ----------
-def _time_days_tab(f: pd.DataFrame, show_table):
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    # Title comes from the renderer
-    counted = f[f["Outcome"].isin(["Win", "BE", "Loss"])]
+def _time_days_summary(f: pd.DataFrame):
+    """Return (Mon–Fri table, None) or (None, info message)."""
+    counted = _counted_rows(f)
 
     # Prefer DayName if present; else fall back to a 'Day' column
     day_col = "DayName" if "DayName" in counted.columns else ("Day" if "Day" in counted.columns else None)
     if not day_col or counted.empty:
-        st.info("No day-of-week signal in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        return None, "No day-of-week signal in current slice."
 
-    order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    df_days = counted[counted[day_col].isin(order)].copy()
-    if df_days.empty:
-        st.info("No Mon–Fri data in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+    # Ordered Mon–Fri key: weekends/unknowns drop out as NaN and the sorted
+    # groupby already yields weekday order, so no re-sort afterwards
+    days = counted[day_col].astype(pd.CategoricalDtype(_DAY_LEVELS[:5], ordered=True))
+    keep = days.notna()
+    if not keep.any():
+        return None, "No Mon–Fri data in current slice."
 
-    df_days["__Day"] = pd.Categorical(df_days[day_col], categories=order, ordered=True)
-
-    def _agg_day(g):
-        r = outcome_rates_from(g)
-        net_rr, ex_rr = _rr_stats(g)
-        return pd.Series(
-            {
-                "Trades": len(g),
-                "Win %": r["win_rate"],
-                "BE %": r["be_rate"],
-                "Loss %": r["loss_rate"],
-                "Net PnL (R)": net_rr,
-                "Expectancy (R)": ex_rr,
-            }
-        )
+    df_days = counted[keep].assign(__Day=days[keep])
+    return _outcome_breakdown(df_days, "__Day", "Day"), None
 
-    perf = (
-        df_days.groupby("__Day")
-        .apply(_agg_day)
-        .reset_index()
-        .rename(columns={"__Day": "Day"})
-    )
 
-    day_df = perf.sort_values("Day")
-    render_day_performance_table(day_df, title="Day Performance (Mon–Fri)")
-    st.markdown("</div>", unsafe_allow_html=True)
+def _time_days_tab(f: pd.DataFrame, show_table, cache_key=None):
+    with _section():
+        # Title comes from the renderer
+        day_df, msg = _tab_cache("days", cache_key, lambda: _time_days_summary(f))
+        if day_df is None:
+            st.info(msg)
+        else:
+            render_day_performance_table(day_df, title="Day Performance (Mon–Fri)")
 
 
 # ---------- NEW: GAP Alignment tab -------------------------------------------
@@ -1191,82 +1443,44 @@ def _gap_alignment_tab(f: pd.DataFrame, show_table):
     GAP Alignment tab:
     Groups by 'Gap Alignment' and shows Trades / Win % / BE % / Loss % / Net PnL (R).
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty or "Gap Alignment" not in f.columns:
-        st.info("No GAP Alignment data in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = f.copy()
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
-    counted["Gap Alignment"] = counted["Gap Alignment"].astype(str).str.strip()
-    counted = counted[~counted["Gap Alignment"].isin(["", "nan", "NaN", "None"])]
-    if counted.empty:
-        st.info("No counted outcomes with GAP Alignment set.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    rows = []
-    for ga, group in counted.groupby("Gap Alignment"):
-        r = outcome_rates_from(group)
-        net_rr, ex_rr = _rr_stats(group)
-        rows.append(
-            dict(
-                Entry_Model=ga,
-                Trades=len(group),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
-            )
-        )
-
-    if rows:
-        df_gap = pd.DataFrame(rows).sort_values("Entry_Model").reset_index(drop=True)
+    with _section():
+        if f is None or f.empty or "Gap Alignment" not in f.columns:
+            st.info("No GAP Alignment data in current slice.")
+            return
+
+        counted = _counted_rows(f)
+        labels, keep = _present_labels(counted["Gap Alignment"])
+        counted = counted[keep].assign(**{"Gap Alignment": labels[keep]})
+        if counted.empty:
+            st.info("No counted outcomes with GAP Alignment set.")
+            return
+
+        df_gap = _outcome_breakdown(counted, "Gap Alignment", "Entry_Model", sort=False)
+        if df_gap.empty:
+            st.info("No GAP Alignment stats available.")
+            return
+        df_gap = df_gap.sort_values("Entry_Model").reset_index(drop=True)
         render_entry_model_table(df_gap, title="GAP Alignment")
-    else:
-        st.info("No GAP Alignment stats available.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
 
 
 # ---------- NEW: Target RR tab -----------------------------------------------
-def _parse_target_rr_label(label: str):
+def _target_rr_sort_keys(labels: pd.Series) -> np.ndarray:
     """
-    Parse Target RR label strings like:
+    Numeric sort keys for Target RR label strings like:
       - "1-2RR"  -> 1.5
       - "10+RR"  -> 10
       - "4RR"    -> 4
-    Used only for sorting buckets nicely.
+    Unparseable labels get NaN. Used only for sorting buckets nicely.
     """
-    if label is None:
-        return None
-    s = str(label).lower().replace("rr", "").strip()
-    if not s:
-        return None
-    s = s.replace(" ", "")
-
-    # range: a-b
-    m = re.match(r"^([+-]?\d+(?:\.\d+)?)[-–]([+-]?\d+(?:\.\d+)?)$", s)
-    if m:
-        a = float(m.group(1))
-        b = float(m.group(2))
-        return (a + b) / 2.0
-
-    # plus: a+
-    m = re.match(r"^([+-]?\d+(?:\.\d+)?)\+$", s)
-    if m:
-        return float(m.group(1))
-
-    # plain numeric
-    try:
-        return float(s)
-    except Exception:
-        return None
+    s = (
+        labels.astype(str).str.lower()
+        .str.replace("rr", "", regex=False)
+        .str.replace(" ", "", regex=False)
+    )
+    parts = s.str.extract(_RR_LABEL_RE)
+    a = parts[0].astype(float).to_numpy()
+    b = parts[1].astype(float).to_numpy()
+    return np.where(np.isnan(b), a, (a + b) / 2.0)
 
 
 def _target_rr_tab(f: pd.DataFrame, show_table):
@@ -1274,46 +1488,25 @@ def _target_rr_tab(f: pd.DataFrame, show_table):
     Risk to Reward tab:
     Groups by 'Target RR' and shows Trades / Win % / BE % / Loss % / Net PnL (R).
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty or "Targeted RR" not in f.columns:
-        st.info("No Target RR data in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = f.copy()
-
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
-    counted["Targeted RR"] = counted["Targeted RR"].astype(str).str.strip()
-    counted = counted[counted["Targeted RR"] != ""]
-    if counted.empty:
-        st.info("No counted outcomes with Target RR set.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    rows = []
-    for target, group in counted.groupby("Targeted RR"):
-        r = outcome_rates_from(group)
-        net_rr, ex_rr = _rr_stats(group)
-        rows.append(
-            dict(
-                Target_RR=target,
-                Trades=len(group),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
-            )
-        )
-
-    if rows:
-        df_rr = pd.DataFrame(rows)
+    with _section():
+        if f is None or f.empty or "Targeted RR" not in f.columns:
+            st.info("No Target RR data in current slice.")
+            return
+
+        counted = _counted_rows(f)
+        labels, keep = _present_labels(counted["Targeted RR"])
+        counted = counted[keep].assign(**{"Targeted RR": labels[keep]})
+        if counted.empty:
+            st.info("No counted outcomes with Target RR set.")
+            return
+
+        df_rr = _outcome_breakdown(counted, "Targeted RR", "Target_RR", sort=False)
+        if df_rr.empty:
+            st.info("No Target RR stats available.")
+            return
 
         # Nice numeric ordering of buckets (1-2RR, 2-3RR, ... 10+RR)
-        df_rr["_sort_num"] = df_rr["Target_RR"].apply(_parse_target_rr_label)
+        df_rr["_sort_num"] = _target_rr_sort_keys(df_rr["Target_RR"])
         df_rr = df_rr.sort_values(
             ["_sort_num", "Target_RR"], na_position="last"
         ).reset_index(drop=True)
@@ -1322,10 +1515,6 @@ def _target_rr_tab(f: pd.DataFrame, show_table):
         # Reuse entry model renderer by mapping label column
         df_rr = df_rr.rename(columns={"Target_RR": "Entry_Model"})
         render_entry_model_table(df_rr, title="Risk to Reward")
-    else:
-        st.info("No Target RR stats available.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
 
 
 # ---------- NEW: Conditions tab (ETF vs HTF) ---------------------------------
@@ -1335,100 +1524,64 @@ def _conditions_tab(f: pd.DataFrame, show_table):
     Uses 'Conditions ETF' and 'Conditions HTF' (e.g. Trending/Ranging)
     and shows performance for each combination.
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty:
-        st.info("No trades for current filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    if "Conditions ETF" not in f.columns and "Conditions HTF" not in f.columns:
-        st.info("No Conditions ETF/HTF columns in current data.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = f.copy()
-    c_etf = "Conditions ETF" if "Conditions ETF" in g.columns else None
-    c_htf = "Conditions HTF" if "Conditions HTF" in g.columns else None
-
-    # Normalise empties
-    if c_etf:
-        g[c_etf] = g[c_etf].astype(str).str.strip()
-        g[c_etf] = g[c_etf].replace({"": None})
-    if c_htf:
-        g[c_htf] = g[c_htf].astype(str).str.strip()
-        g[c_htf] = g[c_htf].replace({"": None})
-
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
-    if c_etf and c_htf:
-        mask_has_any = counted[c_etf].notna() | counted[c_htf].notna()
-    elif c_etf:
-        mask_has_any = counted[c_etf].notna()
-    else:
-        mask_has_any = counted[c_htf].notna()
-
-    counted = counted[mask_has_any]
-    if counted.empty:
-        st.info("No Conditions ETF/HTF values in current slice.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    rows = []
-
-    if c_etf and c_htf:
-        group_cols = [c_etf, c_htf]
-    elif c_etf:
-        group_cols = [c_etf]
-    else:
-        group_cols = [c_htf]
-
-    for key, group in counted.groupby(group_cols):
-        if not isinstance(key, tuple):
-            key = (key,)
-        etf_val = key[0] if c_etf else None
-        htf_val = key[1] if (c_etf and c_htf and len(key) > 1) else (key[0] if (not c_etf and c_htf) else None)
-
-        r = outcome_rates_from(group)
-        net_rr, ex_rr = _rr_stats(group)
+    with _section():
+        if f is None or f.empty:
+            st.info("No trades for current filters.")
+            return
+
+        if "Conditions ETF" not in f.columns and "Conditions HTF" not in f.columns:
+            st.info("No Conditions ETF/HTF columns in current data.")
+            return
+
+        # shallow: the conditions columns are replaced, never edited in place
+        g = f.copy(deep=False)
+        c_etf = "Conditions ETF" if "Conditions ETF" in g.columns else None
+        c_htf = "Conditions HTF" if "Conditions HTF" in g.columns else None
+
+        # Normalise empties
+        for c in (c_etf, c_htf):
+            if c:
+                labels, keep = _present_labels(g[c])
+                g[c] = labels.where(keep)
+
+        counted = _counted_rows(g)
+        group_cols = [c for c in (c_etf, c_htf) if c]
+        mask_has_any = counted[group_cols].notna().any(axis=1)
+
+        counted = counted[mask_has_any]
+        if counted.empty:
+            st.info("No Conditions ETF/HTF values in current slice.")
+            return
+
+        # One multi-key groupby; a missing side stays its own N/A group
+        cond_df = _outcome_breakdown(counted, group_cols, None, dropna=False, sort=False)
+        if cond_df.empty:
+            st.info("No conditions stats available.")
+            return
+
+        etf = cond_df[c_etf].astype(object).fillna("N/A") if c_etf else None
+        htf = cond_df[c_htf].astype(object).fillna("N/A") if c_htf else None
 
         # Multi-line label: ETF on first line, HTF on second line
-        label_lines = []
-        if c_etf:
-            label_lines.append(f"ETF: {etf_val or 'N/A'}")
-        if c_htf:
-            label_lines.append(f"HTF: {htf_val or 'N/A'}")
-        label = "<br>".join(label_lines) if label_lines else "Conditions"
-
-        rows.append(
-            dict(
-                Entry_Model=label,
-                ETF=etf_val or "N/A",
-                HTF=htf_val or "N/A",
-                Trades=len(group),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Net PnL (R)": net_rr,
-                    "Expectancy (R)": ex_rr,
-                },
-            )
-        )
+        if etf is not None and htf is not None:
+            label = "ETF: " + etf + "<br>HTF: " + htf
+        elif etf is not None:
+            label = "ETF: " + etf
+        else:
+            label = "HTF: " + htf
 
-    if rows:
-        cond_df = (
-            pd.DataFrame(rows)
-        )
+        cond_df = cond_df.drop(columns=group_cols)
+        cond_df.insert(0, "Entry_Model", label)
+        cond_df.insert(1, "ETF", "N/A" if etf is None else etf)
+        cond_df.insert(2, "HTF", "N/A" if htf is None else htf)
 
         # Clean ordering: ETF then HTF in a fixed order
         for col_name in ["ETF", "HTF"]:
-            if col_name in cond_df.columns:
-                cond_df[col_name] = cond_df[col_name].fillna("N/A")
-                cond_df[col_name] = pd.Categorical(
-                    cond_df[col_name],
-                    categories=["Trending", "Ranging", "N/A"],
-                    ordered=True,
-                )
+            cond_df[col_name] = pd.Categorical(
+                cond_df[col_name],
+                categories=["Trending", "Ranging", "N/A"],
+                ordered=True,
+            )
 
         cond_df = cond_df.sort_values(
             ["ETF", "HTF", "Win %"],
@@ -1436,10 +1589,6 @@ def _conditions_tab(f: pd.DataFrame, show_table):
         ).reset_index(drop=True)
 
         render_entry_model_table(cond_df, title="Conditions")
-    else:
-        st.info("No conditions stats available.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
 
 
 def _timeframes_tab(f: pd.DataFrame, show_table):
@@ -1448,312 +1597,312 @@ def _timeframes_tab(f: pd.DataFrame, show_table):
     Groups by 'Timeframe' column and shows
     Trades / Win % / BE % / Loss % / Avg RR / Profit Factor.
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-
-    if f is None or f.empty:
-        st.info("No trades for current filters.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Locate the Timeframe column (case-insensitive)
-    lower_map = {str(c).strip().lower(): c for c in f.columns}
-    tf_col = (
-        lower_map.get("entry timeframe")
-        or lower_map.get("timeframe")
-        or lower_map.get("time frame")
-        or lower_map.get("tf")
-    )
-    if tf_col is None:
-        st.info("No 'Timeframe' column found in current data.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    g = f.copy()
-    g["__TF"] = g[tf_col].astype(str).str.strip()
-    g = g[~g["__TF"].isin(["", "nan", "NaN", "None"])]
-    if g.empty:
-        st.info("No timeframe values present.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    counted = g[g["Outcome"].isin(["Win", "BE", "Loss"])]
-    if counted.empty:
-        st.info("No counted outcomes yet for any timeframe.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
-
-    # Define a sort key so common labels order naturally (1M < 5M < 15M < 1H < 4H < 1D …)
-    _TF_ORDER = {
-        "1m": 1, "2m": 2, "3m": 3, "5m": 5, "10m": 10, "15m": 15,
-        "30m": 30, "45m": 45,
-        "1h": 60, "2h": 120, "3h": 180, "4h": 240, "6h": 360, "8h": 480, "12h": 720,
-        "1d": 1440, "d": 1440, "daily": 1440,
-        "1w": 10080, "w": 10080, "weekly": 10080,
-        "1mo": 43200, "monthly": 43200,
-    }
-
-    def _tf_sort_key(label: str) -> float:
-        return _TF_ORDER.get(str(label).strip().lower(), 9999)
-
-    rows = []
-    for tf, group in counted.groupby("__TF"):
-        r = outcome_rates_from(group)
-
-        # Average RR (all counted trades, not wins-only)
-        rr_series = pd.to_numeric(group.get("Closed RR", pd.Series(dtype=float)), errors="coerce").dropna()
-        avg_rr = round(float(rr_series.mean()), 2) if not rr_series.empty else None
-
-        # Profit Factor = sum(winning RR) / abs(sum(losing RR))
-        wins_rr = rr_series[rr_series > 0].sum()
-        losses_rr = abs(rr_series[rr_series < 0].sum())
-        profit_factor = round(wins_rr / losses_rr, 2) if losses_rr > 0 else None
-
-        rows.append(
-            dict(
-                Timeframe=tf,
-                Trades=len(group),
-                **{
-                    "Win %": r["win_rate"],
-                    "BE %": r["be_rate"],
-                    "Loss %": r["loss_rate"],
-                    "Avg RR": avg_rr,
-                    "Profit Factor": profit_factor,
-                },
-            )
+    with _section():
+        if f is None or f.empty:
+            st.info("No trades for current filters.")
+            return
+
+        # Locate the Timeframe column (case-insensitive)
+        lower_map = {str(c).strip().lower(): c for c in f.columns}
+        tf_col = (
+            lower_map.get("entry timeframe")
+            or lower_map.get("timeframe")
+            or lower_map.get("time frame")
+            or lower_map.get("tf")
         )
+        if tf_col is None:
+            st.info("No 'Timeframe' column found in current data.")
+            return
+
+        labels, keep = _present_labels(f[tf_col])
+        g = f[keep].assign(__TF=labels[keep])
+        if g.empty:
+            st.info("No timeframe values present.")
+            return
+
+        counted = _counted_rows(g)
+        if counted.empty:
+            st.info("No counted outcomes yet for any timeframe.")
+            return
+
+        # Define a sort key so common labels order naturally (1M < 5M < 15M < 1H < 4H < 1D …)
+        _TF_ORDER = {
+            "1m": 1, "2m": 2, "3m": 3, "5m": 5, "10m": 10, "15m": 15,
+            "30m": 30, "45m": 45,
+            "1h": 60, "2h": 120, "3h": 180, "4h": 240, "6h": 360, "8h": 480, "12h": 720,
+            "1d": 1440, "d": 1440, "daily": 1440,
+            "1w": 10080, "w": 10080, "weekly": 10080,
+            "1mo": 43200, "monthly": 43200,
+        }
+
+        def _tf_sort_key(label: str) -> float:
+            return _TF_ORDER.get(str(label).strip().lower(), 9999)
+
+        rows = []
+        for tf, group in counted.groupby("__TF", observed=True, sort=False):
+            r = outcome_rates_from(group)
+
+            # Average RR (all counted trades, not wins-only)
+            rr_series = _as_numeric(group.get("Closed RR", pd.Series(dtype=float))).dropna()
+            avg_rr = round(float(rr_series.mean()), 2) if not rr_series.empty else None
+
+            # Profit Factor = sum(winning RR) / abs(sum(losing RR))
+            wins_rr = rr_series[rr_series > 0].sum()
+            losses_rr = abs(rr_series[rr_series < 0].sum())
+            profit_factor = round(wins_rr / losses_rr, 2) if losses_rr > 0 else None
+
+            rows.append(
+                dict(
+                    Timeframe=tf,
+                    Trades=len(group),
+                    **{
+                        "Win %": r["win_rate"],
+                        "BE %": r["be_rate"],
+                        "Loss %": r["loss_rate"],
+                        "Avg RR": avg_rr,
+                        "Profit Factor": profit_factor,
+                    },
+                )
+            )
 
-    if not rows:
-        st.info("No timeframe stats available.")
-        st.markdown("</div>", unsafe_allow_html=True)
-        return
+        if not rows:
+            st.info("No timeframe stats available.")
+            return
 
-    tf_df = (
-        pd.DataFrame(rows)
-        .assign(_sort=lambda d: d["Timeframe"].apply(_tf_sort_key))
-        .sort_values(["_sort", "Timeframe"])
-        .drop(columns=["_sort"])
-        .reset_index(drop=True)
-        .rename(columns={"Timeframe": "Entry_Model"})
-    )
+        tf_df = (
+            pd.DataFrame(rows)
+            .assign(_sort=lambda d: d["Timeframe"].apply(_tf_sort_key))
+            .sort_values(["_sort", "Timeframe"])
+            .drop(columns=["_sort"])
+            .reset_index(drop=True)
+            .rename(columns={"Timeframe": "Entry_Model"})
+        )
 
-    render_timeframe_table(tf_df, title="Timeframe Performance")
-    st.markdown("</div>", unsafe_allow_html=True)
+        render_timeframe_table(tf_df, title="Timeframe Performance")
 
 
 def _coach_tab(f: pd.DataFrame):
     # kept for future use; not referenced in render_all_tabs
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown("## Edge Coach (disabled for now)")
-    st.info("Coach is hidden for now.")
-    st.markdown("</div>", unsafe_allow_html=True)
+    with _section():
+        st.markdown("## Edge Coach (disabled for now)")
+        st.info("Coach is hidden for now.")
 
 
 # ----------------------- Data tab helpers (ALL instruments, rows of 3) --------
-def _render_data_completeness_by_instrument(f_all: pd.DataFrame):
-    """
-    Show completeness cards for EVERY instrument with at least one row.
-    Arranged in rows of 3 cards. Uses existing app styles (kpi/label/value/muted).
-    """
-    st.markdown("### Data Completeness by Instrument")
+_DATA_KPI_TMPL = (
+    "<div class='kpi'>"
+    "<div class='label'>{Label}</div>"
+    "<div class='value' style='color:#4800ff'>{total}</div>"
+    "<div class='muted'>Complete: <b>{complete}</b></div>"
+    "<div class='muted'>Incomplete: <b>{incomplete}</b></div>"
+    "</div>"
+)
+
 
+def _data_completeness_summary(f_all: pd.DataFrame):
+    """Return (per-instrument completeness counts, None) or (None, info message)."""
     if f_all is None or f_all.empty:
-        st.info("No rows for the current filters.")
-        return
+        return None, "No rows for the current filters."
 
     # Normalize/derive Instrument
-    g = _ensure_instrument_column(f_all.copy())
+    g = _ensure_instrument_column(f_all)  # returns its own copy
     if "Instrument" not in g.columns:
-        st.info("No instrument-like column found (looked for Instrument/Pair/Symbol/Ticker).")
-        return
+        return None, "No instrument-like column found (looked for Instrument/Pair/Symbol/Ticker)."
 
     # Drop blanks
     g["Instrument"] = g["Instrument"].astype(str).str.strip()
     g = g[g["Instrument"] != ""]
     if g.empty:
-        st.info("No instrument values present.")
-        return
+        return None, "No instrument values present."
 
     # Define completeness:
     # Incomplete = "Closed RR" is missing/NaN
     # Complete   = "Closed RR" has a real numeric value
-    closed_rr = pd.to_numeric(g["Closed RR"], errors="coerce") if "Closed RR" in g.columns else pd.Series(index=g.index, dtype=float)
-    g["__complete"] = closed_rr.notna()
+    if "Closed RR" in g.columns:
+        complete = _as_numeric(g["Closed RR"]).notna()
+    else:
+        complete = pd.Series(False, index=g.index)
 
-    # Aggregate per instrument
+    # One size/sum pass over the mask; the sorted groupby keeps the cards
+    # alphabetical for a predictable layout
     agg = (
-        g.groupby("Instrument", dropna=False)
-        .agg(total=("Instrument", "size"), complete=("__complete", "sum"))
+        complete.groupby(g["Instrument"], sort=True)
+        .agg(["size", "sum"])
+        .rename(columns={"size": "total", "sum": "complete"})
+        .rename_axis("Instrument")
         .reset_index()
     )
     agg["incomplete"] = agg["total"] - agg["complete"]
+    agg["Label"] = _asset_labels(agg["Instrument"])
+    return agg, None
 
-    # Sort alphabetically for predictable layout (or by total desc)
-    agg = agg.sort_values(["Instrument"]).reset_index(drop=True)
-
-    # Render cards 3-per-row
-    per_row = 3
-    for i in range(0, len(agg), per_row):
-        chunk = agg.iloc[i : i + per_row]
-        cols = st.columns(len(chunk))
-        for col, (_, r) in zip(cols, chunk.iterrows()):
-            with col:
-                label = _asset_label(r["Instrument"])
-                st.markdown(
-                    f"""
-                    <div class='kpi'>
-                      <div class='label'>{label}</div>
-                      <div class='value' style='color:#4800ff'>{int(r['total'])}</div>
-                      <div class='muted'>Complete: <b>{int(r['complete'])}</b></div>
-                      <div class='muted'>Incomplete: <b>{int(r['incomplete'])}</b></div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+
+def _data_completeness_html(f_all: pd.DataFrame):
+    """
+    Return (heading + card grid HTML, None) or (None, info message). The whole
+    block goes out in one markdown call, 3 cards per row via the kpi grid.
+    """
+    agg, msg = _data_completeness_summary(f_all)
+    if agg is None:
+        return None, msg
+    cards = "".join(
+        _DATA_KPI_TMPL.format_map(r)
+        for r in agg[["Label", "total", "complete", "incomplete"]].to_dict("records")
+    )
+    return (
+        "<h3>Data Completeness by Instrument</h3>"
+        f"<div class='kpi-grid kpi-grid-3'>{cards}</div>"
+    ), None
+
+
+def _render_data_completeness_by_instrument(f_all: pd.DataFrame, cache_key=None):
+    """
+    Show completeness cards for EVERY instrument with at least one row.
+    Arranged in rows of 3 cards. Uses existing app styles (kpi/label/value/muted).
+    """
+    html, msg = _tab_cache("data", cache_key, lambda: _data_completeness_html(f_all))
+    if html is None:
+        st.markdown("### Data Completeness by Instrument")
+        st.info(msg)
+        return
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def _data_tab_key(f_all: pd.DataFrame):
+    """Fingerprint of just the columns the completeness cards read."""
+    if f_all is None or f_all.empty:
+        return None
+    wanted = {"instrument", "pair", "symbol", "ticker", "market", "asset", "closed rr"}
+    cols = [c for c in f_all.columns if str(c).strip().lower() in wanted]
+    return _frame_fingerprint(f_all[cols])
 
 
 # ----------------------- Data tab (uses FILTERED-ALL) -----------------------
-def _data_tab(f_all: pd.DataFrame, show_table):
+def _data_tab(f_all: pd.DataFrame, show_table, cache_key=None):
     """
     Show counts of data entries per Instrument with 'Complete' vs 'Incomplete' totals.
     Displays ALL instruments present, in rows of 3 cards.
     """
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    _render_data_completeness_by_instrument(f_all)
-    st.markdown("</div>", unsafe_allow_html=True)
+    with _section():
+        _render_data_completeness_by_instrument(f_all, cache_key=cache_key)
 
 
 # ----------------------- PATCH: Connect Notion templates UI -------------------
-def render_connect_notion_templates_ui():
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown("## Connect Notion / Templates")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        st.markdown("### My Template")
-        p1 = Path("assets/templates/my_template.csv")
-        if p1.exists():
-            st.download_button(
-                "⬇️ Download My Template (CSV)",
-                data=p1.read_bytes(),
-                file_name="my_template.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
-        else:
-            st.warning("Missing: assets/templates/my_template.csv")
-
-    with c2:
-        st.markdown("### TradingPools Template")
-        p2 = Path("assets/templates/tradingpools_template.csv")
-        if p2.exists():
-            st.download_button(
-                "⬇️ Download TradingPools Template (CSV)",
-                data=p2.read_bytes(),
-                file_name="tradingpools_template.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
-        else:
-            st.warning("Missing: assets/templates/tradingpools_template.csv")
-
-    st.divider()
-    st.subheader("Upload your filled template")
-    up = st.file_uploader(
-        "CSV/TSV/XLSX supported. Both templates work.",
-        type=["csv", "tsv", "xlsx", "xls"],
-        key="upload_templates_dual",
-    )
+@st.cache_resource(show_spinner=False)
+def _load_template_bytes(path: str) -> bytes | None:
+    """Bundled template file contents, read once per process (None if missing)."""
+    try:
+        return Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
 
-    if up:
-        uploads = Path("uploads")
-        uploads.mkdir(parents=True, exist_ok=True)
-        fpath = uploads / up.name
-        with open(fpath, "wb") as f:
-            f.write(up.getbuffer())
 
-        df, mapping_name = adapt_auto(fpath, "config/templates")
-        if mapping_name:
-            st.success(f"Detected template: **{mapping_name}**")
-        else:
-            st.warning(
-                "No mapping detected. Add a JSON mapping under config/templates/ if needed."
-            )
+def render_connect_notion_templates_ui():
+    with _section():
+        st.markdown("## Connect Notion / Templates")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("### My Template")
+            data1 = _load_template_bytes("assets/templates/my_template.csv")
+            if data1 is not None:
+                st.download_button(
+                    "⬇️ Download My Template (CSV)",
+                    data=data1,
+                    file_name="my_template.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                )
+            else:
+                st.warning("Missing: assets/templates/my_template.csv")
+
+        with c2:
+            st.markdown("### TradingPools Template")
+            data2 = _load_template_bytes("assets/templates/tradingpools_template.csv")
+            if data2 is not None:
+                st.download_button(
+                    "⬇️ Download TradingPools Template (CSV)",
+                    data=data2,
+                    file_name="tradingpools_template.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                )
+            else:
+                st.warning("Missing: assets/templates/tradingpools_template.csv")
+
+        st.divider()
+        st.subheader("Upload your filled template")
+        up = st.file_uploader(
+            "CSV/TSV/XLSX supported. Both templates work.",
+            type=["csv", "tsv", "xlsx", "xls"],
+            key="upload_templates_dual",
+        )
 
-        # quick sanity checks
-        issues = []
-        for col in ["Date", "Pair", "Outcome", "Closed RR", "Is Complete"]:
-            if col not in df.columns:
-                issues.append(f"Missing required column: {col}")
-        if "Outcome" in df.columns:
-            bad = ~df["Outcome"].isin(["Win", "BE", "Loss"]) & df["Outcome"].notna()
-            if bad.any():
-                issues.append(
-                    "Unexpected Outcome values: "
-                    + str(list(df.loc[bad, "Outcome"].astype(str).unique()[:5]))
+        if up:
+            df, mapping_name, issues = parse_template_upload(up)
+            if mapping_name:
+                st.success(f"Detected template: **{mapping_name}**")
+            else:
+                st.warning(
+                    "No mapping detected. Add a JSON mapping under config/templates/ if needed."
                 )
 
-        if issues:
-            st.info("Checks:\n\n- " + "\n- ".join(issues))
+            if issues:
+                st.info("Checks:\n\n- " + "\n- ".join(issues))
 
-        st.dataframe(df.head(25), use_container_width=True)
+            st.dataframe(df.head(25), use_container_width=True)
 
-    st.markdown("</div>", unsafe_allow_html=True)
 
 
 # ----------------------- UPDATED render_all_tabs (with new tabs) ----
-def render_all_tabs(f: pd.DataFrame, df_all: pd.DataFrame, styler, show_table):
-    # completion-aware slice
-    f_perf = _prep_perf_df(f)
-    df_all_safe = df_all.copy() if df_all is not None else df_all
-
-    # Dashboard tabs:
-    (
-        t1,
-        t2,
-        t3,
-        t4,
-        t5,
-        t6,
-        t7,
-        t8,
-        t9,
-    ) = st.tabs(
-        [
-            "Growth",
-            "Entry Models",
-            "Confluence",
-            "Assets",
-            "Sessions",
-            "Days",
-            "Conditions",
-            "Timeframes",
-            "Data",
-        ]
-    )
-
-    with t1:
-        _growth_tab(f_perf, df_all_safe, styler)
+DASHBOARD_TABS = [
+    "Growth",
+    "Entry Models",
+    "Confluence",
+    "Assets",
+    "Sessions",
+    "Days",
+    "Conditions",
+    "Timeframes",
+    "Data",
+]
 
-    with t2:
-        _entry_models_tab(f_perf, show_table)
 
-    with t3:
-        _confluences_tab(f_perf, show_table)
-
-    with t4:
-        _instruments_tab(f_perf, show_table)
-
-    with t5:
-        _sessions_tab(f_perf, show_table)
+def render_all_tabs(f: pd.DataFrame, df_all: pd.DataFrame, styler, show_table):
+    # Dashboard tabs: st.tabs would run every tab body on every rerun, so the
+    # tab strip is a horizontal radio and only the selected tab is computed.
+    active = st.radio(
+        "Dashboard tab",
+        DASHBOARD_TABS,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed",
+    )
 
-    with t6:
-        _time_days_tab(f_perf, show_table)  # Days only (Mon–Fri)
+    # Tabs only read df_all (helpers that add columns copy internally)
+    df_all_safe = df_all
+    if active == "Data":
+        _data_tab(df_all_safe, show_table, cache_key=_data_tab_key(df_all_safe))  # filtered-all completeness
+        return
 
-    with t7:
+    # completion-aware slice; one fingerprint per rerun keys both the prep
+    # cache and the per-tab aggregates
+    f_key = _frame_fingerprint(f) if f is not None else None
+    f_perf = _prep_perf_df_for(f_key, f) if f_key is not None else f
+
+    if active == "Growth":
+        _growth_tab(f_perf, df_all_safe, styler, cache_key=f_key)
+    elif active == "Entry Models":
+        _entry_models_tab(f_perf, show_table, cache_key=f_key)
+    elif active == "Confluence":
+        _confluences_tab(f_perf, show_table, cache_key=f_key)
+    elif active == "Assets":
+        _instruments_tab(f_perf, show_table, cache_key=f_key)
+    elif active == "Sessions":
+        _sessions_tab(f_perf, show_table, cache_key=f_key)
+    elif active == "Days":
+        _time_days_tab(f_perf, show_table, cache_key=f_key)  # Days only (Mon–Fri)
+    elif active == "Conditions":
         _conditions_tab(f_perf, show_table)
-
-    with t8:
+    elif active == "Timeframes":
         _timeframes_tab(f_perf, show_table)
-
-    with t9:
-        _data_tab(df_all_safe, show_table)  # filtered-all completeness
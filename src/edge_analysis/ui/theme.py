@@ -1,29 +1,197 @@
 from __future__ import annotations 
 from pathlib import Path
-import base64
+import binascii
+import functools
+import mmap
+import re
+import string
+import sys
+from types import MappingProxyType
 import streamlit as st
-import altair as alt
-import streamlit.components.v1 as components
-from PIL import Image
+# altair, PIL and streamlit.components are imported where used: the dashboard's
+# charts are raw Vega-Lite specs and Pillow only reads the logo's size.
 
 # ───────────────────────── Brand / assets ─────────────────────────
 PURPLE_HEX = "#4800ff"
 ASSETS_DIR = Path("assets")
 RAW_ICON   = ASSETS_DIR / "edge_favicon_mark.png"
 FAVI_PNG   = ASSETS_DIR / "edge_favicon_transparent.png"
-HEADER_LOGO_LIGHT = ASSETS_DIR / "edge_logo.png"
-HEADER_LOGO_DARK  = ASSETS_DIR / "edge_logo_dark.png"  # kept for compatibility
+# Served by Streamlit at app/static/ when server.enableStaticServing is on
+STATIC_DIR = Path("static")
+STATIC_URL = "app/static"
+# WebP copies of edge_logo(.png/_dark.png), ~40x smaller once base64-inlined
+HEADER_LOGO_LIGHT = STATIC_DIR / "edge_logo.webp"
+HEADER_LOGO_DARK  = STATIC_DIR / "edge_logo_dark.webp"  # kept for compatibility
+# Static (palette-independent) rules; only the :root variables are built in code
+THEME_CSS = STATIC_DIR / "edge_theme.css"
 
 
 # ───────────────────────── Light-only palette ─────────────────────
-LIGHT = dict(
+# Read-only: the palette is fixed at import, so cached CSS/config built from
+# it can never go stale.
+LIGHT = MappingProxyType(dict(
     bg="#f6f7fb", card="#ffffff", ink="#0f172a",
     muted="#64748b", grid="#e5e7eb", hover="#f3f4f6",
     chart_bg="#ffffff", accent=PURPLE_HEX, toggle="#000000", border="#d1d5db"
-)
+))
 
 
 # ─────────────────────── CONSOLIDATED THEME INJECTION ──────────────
+def get_vega_config():
+    """
+    Vega-Lite "config" block for the light theme. Used by the Altair theme
+    and by charts that pass raw Vega-Lite specs to st.vega_lite_chart.
+    """
+    c = LIGHT
+    return {
+        "background": c["chart_bg"],
+        "view": {"stroke": "transparent", "fill": c["chart_bg"]},
+        "axis": {"labelColor": c["ink"], "titleColor": c["ink"],
+                 "gridColor": c["grid"], "tickColor": c["grid"], "grid": True},
+        "legend": {"labelColor": c["ink"], "titleColor": c["ink"]},
+    }
+
+
+_ALT_CONFIG_LIGHT = {"config": get_vega_config()}
+
+
+def _enable_altair_theme():
+    """
+    Register (once) and enable the edge_light Altair theme, but only if
+    something has already imported Altair; importing it here would cost a
+    few hundred ms of cold start for charts this app doesn't draw with it.
+    """
+    alt = sys.modules.get("altair")
+    if alt is None:
+        return
+    if "edge_light" not in alt.themes.names():
+        alt.themes.register("edge_light", lambda: _ALT_CONFIG_LIGHT)
+    if alt.themes.active != "edge_light":
+        alt.themes.enable("edge_light")
+
+
+# Quoted strings (kept verbatim) | dropped: comments, a block's last ";", space
+# before "!important" | whitespace around {};,> | after ":" | other whitespace
+_CSS_MIN_RE = re.compile(
+    r"""("[^"]*"|'[^']*')|(/\*.*?\*/|\s*;\s*(?=})|\s+(?=!))|\s*([{};,>])\s*|(:)\s+|\s+""",
+    re.S,
+)
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace; quoted strings (e.g. data: URLs) are untouched."""
+    def _sub(m):
+        if m.group(1) is not None:
+            return m.group(1)
+        if m.group(2) is not None:
+            return ""
+        return m.group(3) or m.group(4) or " "
+    return _CSS_MIN_RE.sub(_sub, css).strip()
+
+
+def _hex_to_oklab(hex_color: str):
+    r, g, b = (int(hex_color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    r, g, b = (v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4 for v in (r, g, b))
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def _oklab_to_hex(L: float, a: float, b: float) -> str:
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    rgb = (4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+           -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+           -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s)
+    rgb = (12.92 * v if v <= 0.0031308 else 1.055 * v ** (1 / 2.4) - 0.055 for v in rgb)
+    return "#" + "".join(f"{round(min(max(v, 0.0), 1.0) * 255):02x}" for v in rgb)
+
+
+def _mix_oklab(first: str, second: str, second_pct: float) -> str:
+    """Hex result of CSS color-mix(in oklab, first, second <second_pct>%)."""
+    t = second_pct / 100
+    return _oklab_to_hex(*(x + (y - x) * t for x, y in zip(_hex_to_oklab(first), _hex_to_oklab(second))))
+
+
+# Tints the stylesheet used to compute with color-mix() on every style recalc
+_MIXED = MappingProxyType(dict(
+    accent_tint=_mix_oklab("#ffffff", LIGHT["accent"], 12),   # Edge Coach user bubble
+    accent_edge=_mix_oklab(LIGHT["accent"], "#000000", 20),   # ...and its border
+    grey_tint=_mix_oklab("#ffffff", "#000000", 6),            # assistant bubble
+    brand_tint=_mix_oklab(PURPLE_HEX, "#ffffff", 85),         # live banner
+    brand_line=_mix_oklab(PURPLE_HEX, "#ffffff", 70),         # ...and its border
+))
+
+# CSS variables; substituted from the palette by _root_css()
+_ROOT_TMPL = string.Template(
+    ":root{--accent:$accent;--ink:$ink;--muted:$muted;--bg:$bg;--card:$card;"
+    "--grid:$grid;--hover:$hover;--toggle:$toggle;--border:$border;"
+    "--brand:$brand;--ea-bg-soft:#f5f6fb;"
+    "--ea-accent-tint:$accent_tint;--ea-accent-edge:$accent_edge;--ea-grey-tint:$grey_tint;"
+    "--ea-brand-tint:$brand_tint;--ea-brand-line:$brand_line;}"
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _root_css(theme: str = "light") -> str:
+    """The :root variables block for `theme` (light-only palette)."""
+    return _ROOT_TMPL.substitute(LIGHT, brand=PURPLE_HEX, **_MIXED)
+
+
+_CSS_VAR_RE = re.compile(r"var\(--([\w-]+)\)")
+
+
+def _resolve_vars(css: str, theme: str = "light") -> str:
+    """Replace var(--x) for the :root palette variables with their literal values."""
+    values = dict(re.findall(r"--([\w-]+):([^;}]+)", _root_css(theme)))
+    return _CSS_VAR_RE.sub(lambda m: values.get(m.group(1), m.group(0)), css)
+
+
+@functools.lru_cache(maxsize=1)
+def _theme_css_url() -> str:
+    """
+    app/static URL of THEME_CSS (versioned by mtime), or "" when it has to be
+    inlined: static serving is off, or this Streamlit's static route sends .css
+    as text/plain (the old tornado handler only whitelists media types).
+    """
+    try:
+        if not (st.get_option("server.enableStaticServing") and THEME_CSS.exists()):
+            return ""
+        try:
+            from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+        except ImportError:
+            pass  # starlette server: Content-Type comes from mimetypes
+        else:
+            if ".css" not in SAFE_APP_STATIC_FILE_EXTENSIONS:
+                return ""
+        return f"{STATIC_URL}/{THEME_CSS.name}?v={THEME_CSS.stat().st_mtime_ns}"
+    except Exception:
+        return ""
+
+
+@functools.lru_cache(maxsize=2)
+def _theme_css(theme: str = "light") -> str:
+    """
+    The theme markup for `theme`, built once per process: the palette variables
+    from _root_css() inline, every other rule from THEME_CSS, linked so the
+    browser caches it when it is served from app/static, else minified inline
+    with the palette variables already resolved. :root stays for the inline
+    styles elsewhere in the app (e.g. var(--brand)).
+    """
+    url = _theme_css_url()
+    if url:
+        return f'\n<style>\n{_root_css(theme)}\n</style>\n<link rel="stylesheet" href="{url}">\n'
+    try:
+        rules = _resolve_vars(_minify_css(THEME_CSS.read_text(encoding="utf-8")), theme)
+    except OSError:
+        rules = ""
+    return f"\n<style>\n{_root_css(theme)}\n{rules}\n</style>\n"
+
+
 def inject_theme():
     """
     SINGLE injection point for ALL Edge Analysis CSS.
@@ -37,853 +205,202 @@ def inject_theme():
     - tabs.py CSS patches (lines 26-76)
     - theme.py apply_theme() & inject_global_css()
     """
-    c = LIGHT
     st.session_state["ui_theme"] = "light"
     
     # Configure Altair charts (light theme)
-    def _alt():
-        return {"config":{
-            "background": c["chart_bg"],
-            "view": {"stroke": "transparent", "fill": c["chart_bg"]},
-            "axis": {"labelColor": c["ink"], "titleColor": c["ink"],
-                     "gridColor": c["grid"], "tickColor": c["grid"], "grid": True},
-            "legend": {"labelColor": c["ink"], "titleColor": c["ink"]},
-        }}
-    alt.themes.register("edge_light", _alt)
-    alt.themes.enable("edge_light")
-    
-    # Chevron SVG for dropdowns
-    chevron_svg = (
-        "data:image/svg+xml;utf8,"
-        "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24'>"
-        "<path d='M6 9l6 6 6-6' fill='none' stroke='%230f172a' stroke-width='2' "
-        "stroke-linecap='round' stroke-linejoin='round'/>"
-        "</svg>"
-    )
+    _enable_altair_theme()
     
     # ALL CSS IN ONE PLACE
-    st.markdown(f"""
-    <style>
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* CSS VARIABLES                                                            */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    :root {{
-      --accent: {c['accent']};
-      --ink: {c['ink']};
-      --muted: {c['muted']};
-      --bg: {c['bg']};
-      --card: {c['card']};
-      --grid: {c['grid']};
-      --hover: {c['hover']};
-      --toggle: {c['toggle']};
-      --border: {c['border']};
-      --brand: {PURPLE_HEX};
-      --ea-bg-soft: #f5f6fb;
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* MOBILE TYPOGRAPHY & SPACING                                              */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    @media (max-width: 480px) {{
-      .block-container {{
-        padding-left: .6rem !important;
-        padding-right: .6rem !important;
-        padding-top: .5rem !important;
-      }}
-      html {{ font-size: 14px; }}
-      body, p, span, div {{ line-height: 1.15; }}
-      
-      .entry-card {{
-        padding: 14px 14px;
-        border-radius: 12px;
-      }}
-      .entry-card h2 {{
-        font-size: 20px;
-        margin: 0 0 6px 0;
-      }}
-      
-      table.entry-model-table, table.session-perf-table, table.day-perf-table {{
-        font-size: 12px;
-        table-layout: fixed;
-        width: 100%;
-      }}
-      .entry-model-table thead th,
-      .entry-model-table tbody td,
-      .session-perf-table thead th,
-      .session-perf-table tbody td,
-      .day-perf-table thead th,
-      .day-perf-table tbody td {{
-        padding: 8px 6px;
-        line-height: 1.15;
-        word-break: break-word;
-        hyphens: auto;
-      }}
-      .entry-model-table td:nth-child(2),
-      .session-perf-table td:nth-child(2),
-      .day-perf-table td:nth-child(2) {{ width: 64px; }}
-      .entry-model-table td:nth-child(3),
-      .session-perf-table td:nth-child(3),
-      .day-perf-table td:nth-child(3) {{ width: 72px; }}
-      
-      .stTabs [data-baseweb="tab"] {{ padding: 6px 10px; }}
-      .stTabs [data-baseweb="tab"] p {{
-        font-size: 14px;
-        margin: 0;
-      }}
-      
-      div[data-testid="stMetricValue"] {{ font-size: 24px; }}
-      div[data-testid="stMetricDelta"] {{ font-size: 12px; }}
-      .stMetric {{ padding: 6px 8px; }}
-      
-      .stAltairChart, .stPlotlyChart, .stVegaLiteChart {{
-        margin-top: 4px;
-        margin-bottom: 8px;
-      }}
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* ZERO-SCROLL MOBILE OPTIMIZATION (≤480px)                                 */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    @media (max-width: 480px) {{
-      html {{ font-size: 12.5px; }}
-      .block-container {{
-        padding-left: .45rem !important;
-        padding-right: .45rem !important;
-        padding-top: .4rem !important;
-      }}
-      
-      .stMetric {{ padding: 4px 6px !important; }}
-      div[data-testid="stMetricValue"] {{ font-size: 20px !important; }}
-      div[data-testid="stMetricDelta"] {{ font-size: 11px !important; }}
-      
-      .entry-card h2 {{
-        font-size: 17px !important;
-        margin: 0 0 4px 0 !important;
-      }}
-      h2, h3 {{
-        font-size: 19px !important;
-        margin: 8px 0 6px 0 !important;
-      }}
-      
-      table.entry-model-table,
-      table.session-perf-table,
-      table.day-perf-table {{
-        width: 100% !important;
-        table-layout: fixed !important;
-        font-size: 10.5px !important;
-        border-spacing: 0 !important;
-        min-width: 0 !important;
-      }}
-      .entry-model-table thead th,
-      .entry-model-table tbody td,
-      .session-perf-table thead th,
-      .session-perf-table tbody td,
-      .day-perf-table thead th,
-      .day-perf-table tbody td {{
-        padding: 4px 4px !important;
-        line-height: 1.05 !important;
-        word-break: break-word !important;
-        overflow-wrap: anywhere !important;
-        white-space: normal !important;
-        hyphens: auto !important;
-      }}
-      .entry-model-table th:nth-child(1),
-      .entry-model-table td:nth-child(1),
-      .session-perf-table th:nth-child(1),
-      .session-perf-table td:nth-child(1),
-      .day-perf-table th:nth-child(1),
-      .day-perf-table td:nth-child(1) {{
-        width: 42% !important;
-      }}
-      
-      .stTabs [data-baseweb="tab"] {{ padding: 5px 8px !important; }}
-      .stTabs [data-baseweb="tab"] p {{
-        font-size: 13px !important;
-        margin: 0 !important;
-      }}
-      .spacer-12 {{ height: 6px !important; }}
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* CARD & TABLE STYLING                                                     */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    .entry-card {{
-      background: #fff;
-      border-radius: 16px;
-      padding: 20px 24px;
-      box-shadow: 0 6px 22px rgba(0,0,0,.06);
-    }}
-    .entry-card h2 {{
-      margin: 0 0 10px 0;
-      font-size: 28px;
-      line-height: 1.2;
-      font-weight: 800;
-    }}
-    
-    .entry-model-table {{
-      width: 100%;
-      border-collapse: separate;
-      border-spacing: 0;
-      font-size: 16px;
-      table-layout: fixed;
-      min-width: 520px;
-    }}
-    .entry-model-table thead th {{
-      text-align: left;
-      font-weight: 700;
-      background: #f6f7fb;
-      padding: 12px 10px;
-      border-bottom: 2px solid {PURPLE_HEX};
-    }}
-    .entry-model-table tbody td {{
-      padding: 12px 10px;
-      border-bottom: 1px solid #eef0f5;
-    }}
-    .entry-model-table tbody tr:nth-child(even) td {{
-      background: #fafbff;
-    }}
-    .entry-model-table td.num,
-    .entry-model-table th.num {{
-      text-align: right;
-    }}
-    .entry-model-table td.text,
-    .entry-model-table th.text {{
-      text-align: left;
-    }}
-    .entry-card .table-wrap {{
-      overflow-x: auto;
-      -webkit-overflow-scrolling: touch;
-    }}
-    .entry-model-table th,
-    .entry-model-table td {{
-      word-wrap: break-word;
-      overflow-wrap: anywhere;
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* MOBILE TAB WRAPPING (≤768px)                                             */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    @media (max-width: 768px) {{
-      div[data-baseweb="tab-list"] {{
-        flex-wrap: wrap !important;
-        overflow: visible !important;
-        gap: 8px 12px !important;
-      }}
-      div[data-baseweb="tab"] {{
-        flex: 0 1 auto !important;
-        margin: 0 !important;
-      }}
-      div[data-baseweb="tab-list"]::before,
-      div[data-baseweb="tab-list"]::after {{
-        content: none !important;
-        display: none !important;
-      }}
-      .stTabs [data-baseweb="tab-highlight"] {{
-        display: none !important;
-      }}
-      .stTabs [role="tab"][aria-selected="true"] {{
-        border-bottom: none !important;
-        box-shadow: none !important;
-      }}
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* DATE PICKER STYLING                                                      */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    
-    /* Input container */
-    [data-testid="stDateInput"] > div > div {{
-      border-radius: 12px !important;
-      border: 1px solid #e5e7eb !important;
-      background-color: #ffffff !important;
-      overflow: hidden !important;
-    }}
-    [data-testid="stDateInput"] input {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-      border: none !important;
-      box-shadow: none !important;
-    }}
-    [data-testid="stDateInput"] input:focus {{
-      outline: 2px solid {PURPLE_HEX} !important;
-      box-shadow: 0 0 0 1px rgba(72,0,255,0.5) !important;
-    }}
-    [data-testid="stDateInput"] div:focus {{
-      outline: none !important;
-    }}
-    
-    /* Calendar popup - FORCE LIGHT THEME */
-    .stDateInput [role="dialog"],
-    .stDateInput [data-baseweb="popover"],
-    .stDateInput [data-baseweb="popover"] > div {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-      border: 1px solid #d1d5db !important;
-      box-shadow: 0 4px 16px rgba(0, 0, 0, 0.15) !important;
-    }}
-    
-    .stDateInput [role="dialog"] [data-baseweb="datepicker"],
-    .stDateInput [data-baseweb="popover"] [data-baseweb="datepicker"],
-    .stDateInput [role="dialog"] [data-baseweb="datepicker"] > div,
-    .stDateInput [data-baseweb="popover"] [data-baseweb="datepicker"] > div {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-    }}
-    
-    /* Calendar header and body */
-    .stDateInput [data-baseweb="calendar"],
-    .stDateInput [data-baseweb="datepicker"],
-    .stDateInput [data-baseweb="calendar"] > div,
-    .stDateInput [data-baseweb="datepicker"] > div {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-    }}
-    
-    /* Month/Year dropdowns - FORCE DARK TEXT */
-    .stDateInput [data-baseweb="select"],
-    .stDateInput [data-baseweb="select"] div,
-    .stDateInput [data-baseweb="select"] span,
-    .stDateInput [data-baseweb="select"] button {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-    }}
-    
-    /* Dropdown menu items */
-    .stDateInput [data-baseweb="menu"] [data-baseweb="menu-item"] {{
-      background-color: #ffffff !important;
-      color: #0f172a !important;
-    }}
-    .stDateInput [data-baseweb="menu"] [data-baseweb="menu-item"]:hover,
-    .stDateInput [data-baseweb="menu"] [data-baseweb="menu-item"][aria-selected="true"] {{
-      background-color: rgba(148,163,184,0.18) !important;
-      color: #0f172a !important;
-    }}
-    
-    /* Day buttons */
-    .stDateInput [data-baseweb="calendar"] button {{
-      background: transparent !important;
-      color: #0f172a !important;
-    }}
-    .stDateInput [data-baseweb="calendar"] button:hover {{
-      background-color: rgba(148,163,184,0.18) !important;
-    }}
-    
-    /* Selected day - Edge purple (PATCH 3 from tabs.py) */
-    .stDateInput .react-datepicker__day--selected,
-    .stDateInput .react-datepicker__day--keyboard-selected,
-    .stDateInput [data-baseweb="calendar"] button[aria-pressed="true"],
-    .stDateInput [data-baseweb="calendar"] button[aria-label*="selected"],
-    .react-datepicker__day--selected,
-    .react-datepicker__day--keyboard-selected {{
-      background-color: {PURPLE_HEX} !important;
-      color: #ffffff !important;
-    }}
-    
-    /* All text inside calendar */
-    .stDateInput [data-baseweb="calendar"] span,
-    .stDateInput [data-baseweb="datepicker"] span {{
-      color: #0f172a !important;
-    }}
-    
-    /* Hide duplicate date display below input */
-    [data-testid="stDateInput"] > label + div + div {{
-      display: none !important;
-    }}
-    [data-testid="stDateInput"] [data-testid="stMarkdownContainer"] {{
-      display: none !important;
-    }}
-    div[data-testid="stDateInput"] + div[data-testid="stMarkdownContainer"],
-    div[data-testid="stDateInput"] + div[data-testid="stText"],
-    div[data-testid="stDateInput"] ~ p {{
-      display: none !important;
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* SELECTBOX STYLING (PATCH 1 from tabs.py + dropdown CSS from app.py)     */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    
-    /* Force readable text inside selectboxes */
-    .stSelectbox [data-baseweb="select"] div {{
-      color: #000000 !important;
-    }}
-    .stSelectbox [data-baseweb="popover"] {{
-      max-height: 260px;
-      overflow-y: auto;
-      border-radius: 16px;
-      box-shadow: 0 0 24px rgba(0,0,0,0.7);
-    }}
-    
-    /* Hide autocomplete input (dropdown CSS from app.py) */
-    [data-baseweb="select"] input[aria-autocomplete="list"] {{
-      caret-color: transparent !important;
-      pointer-events: none !important;
-      user-select: none !important;
-      opacity: 0 !important;
-      width: 0 !important;
-      min-width: 0 !important;
-    }}
-    
-    /* Make entire select clickable */
-    [data-baseweb="select"] [role="combobox"],
-    [data-baseweb="select"] > div {{
-      cursor: pointer !important;
-    }}
-    
-    /* Hide default SVG chevron */
-    [data-baseweb="select"] svg {{
-      display: none !important;
-    }}
-    
-    /* Add custom chevron */
-    [data-baseweb="select"] > div {{
-      position: relative !important;
-    }}
-    [data-baseweb="select"] > div::after {{
-      content: "";
-      position: absolute;
-      right: 12px;
-      top: 50%;
-      transform: translateY(-50%);
-      width: 16px;
-      height: 16px;
-      background-image: url("{chevron_svg}");
-      background-repeat: no-repeat;
-      background-size: 16px 16px;
-      opacity: .9;
-      pointer-events: none;
-    }}
-    
-    /* Preserve normal inputs */
-    [data-testid="stTextInput"] input,
-    [data-testid="stPassword"] input,
-    [data-testid="stTextArea"] textarea {{
-      pointer-events: auto !important;
-      opacity: 1 !important;
-      width: 100% !important;
-    }}
-    
-    /* Prevent popover from being cut off (PATCH 4 from tabs.py) */
-    [data-baseweb="popover"] {{
-      z-index: 999999 !important;
-      overflow: visible !important;
-    }}
-    [data-baseweb="popover"] [data-baseweb="menu"] {{
-      max-height: 260px !important;
-      overflow-y: auto !important;
-      border-radius: 16px !important;
-      box-shadow: 0 0 24px rgba(0,0,0,0.30) !important;
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* SOFT BACKGROUND & LABEL FIXES (from app.py inject_soft_bg, inject_label_fix) */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    [data-testid="stAppViewContainer"] {{
-      background: var(--ea-bg-soft) !important;
-    }}
-    header[data-testid="stHeader"],
-    [data-testid="stToolbar"] {{
-      background: var(--ea-bg-soft) !important;
-      border-bottom: none !important;
-      box-shadow: none !important;
-    }}
-    [data-testid="stSidebar"] {{
-      background: #ffffff !important;
-    }}
-    [data-testid="stSidebar"] * {{
-      color: #0f172a !important;
-    }}
-    
-    /* Fix label colors for form inputs */
-    [data-testid="stSelectbox"] label,
-    [data-testid="stRadio"] label,
-    [data-testid="stTextInput"] label {{
-      color: #0f172a !important;
-      font-weight: 600 !important;
-    }}
-    
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    /* GLOBAL CSS FROM theme.py inject_global_css()                             */
-    /* ═══════════════════════════════════════════════════════════════════════ */
-    
-    /* Lock sidebar permanently open & remove toggles */
-    [data-testid="collapsedControl"],
-    [data-testid="stSidebarCollapseButton"],
-    [data-testid="stSidebarCollapseControl"],
-    button[aria-label="Toggle sidebar"],
-    button[title="Collapse sidebar"],
-    button[title="Expand sidebar"],
-    header [data-testid="baseButton-headerNoPadding"],
-    header [data-testid="baseButton-header"],
-    [data-testid="stSidebar"] [data-testid="icon-chevron-right"],
-    [data-testid="stSidebar"] [data-testid="icon-chevron-left"] {{
-      display: none !important;
-    }}
-    
-    section[data-testid="stSidebar"] {{
-      width: 360px !important;
-      min-width: 360px !important;
-      max-width: 360px !important;
-      transform: none !important;
-      visibility: visible !important;
-      background: var(--card) !important;
-      border-right: 1px solid var(--grid) !important;
-    }}
-    
-    /* Force all sidebar text/icons black */
-    section[data-testid="stSidebar"] * {{
-      color: var(--ink) !important;
-    }}
-    section[data-testid="stSidebar"] svg {{
-      fill: var(--ink) !important;
-      stroke: var(--ink) !important;
-    }}
-    section[data-testid="stSidebar"] .block-container {{
-      padding-top: 12px;
-    }}
-    section[data-testid="stSidebar"] label,
-    section[data-testid="stSidebar"] legend {{
-      color: var(--ink) !important;
-      font-weight: 700;
-    }}
-    
-    /* App shell (light) */
-    .stApp {{
-      background-color: var(--bg);
-      color: var(--ink);
-    }}
-    .block-container {{
-      padding: 18px 26px 52px 26px;
-      max-width: 1400px;
-    }}
-    header[data-testid="stHeader"] {{
-      background: var(--card) !important;
-      border-bottom: 1px solid var(--grid);
-    }}
-    header[data-testid="stHeader"] * {{
-      color: var(--ink) !important;
-    }}
-    div[data-testid="stToolbar"] {{
-      display: none !important;
-    }}
-    
-    /* Controls & menus (stay light on hover/focus) */
-    [data-baseweb="select"] > div,
-    [data-baseweb="input"] > div,
-    [data-baseweb="base-input"],
-    input, textarea {{
-      background: var(--card) !important;
-      color: var(--ink) !important;
-      border: 1px solid var(--border) !important;
-      border-radius: 12px !important;
-      box-shadow: none !important;
-    }}
-    
-    /* Focus rings without darkening */
-    [data-baseweb="input"]:focus-within > div,
-    [data-baseweb="select"]:focus-within > div,
-    input:focus, textarea:focus {{
-      background: var(--card) !important;
-      border-color: var(--border) !important;
-      outline: none !important;
-      box-shadow: 0 0 0 2px rgba(72,0,255,0.10) !important;
-    }}
-    
-    /* Buttons */
-    .stButton > button {{
-      background: #ffffff !important;
-      color: var(--ink) !important;
-      border: 1px solid var(--border) !important;
-      border-radius: 12px !important;
-      box-shadow: none !important;
-      transition: background .12s ease, border-color .12s ease !important;
-    }}
-    .stButton > button:hover,
-    .stButton > button:focus {{
-      background: #f9fafb !important;
-      border-color: var(--border) !important;
-    }}
-    .stButton > button:active {{
-      background: #f3f4f6 !important;
-      border-color: var(--border) !important;
-    }}
-    
-    /* Menus / popovers */
-    [data-baseweb="menu"],
-    [data-baseweb="popover"] [data-baseweb="menu"],
-    ul[role="listbox"] {{
-      background: var(--card) !important;
-      color: var(--ink) !important;
-      border: 1px solid var(--grid) !important;
-      box-shadow: 0 8px 24px rgba(15,23,42,0.12) !important;
-    }}
-    [data-baseweb="menu"] [data-baseweb="menu-item"],
-    ul[role="listbox"] [data-baseweb="menu-item"] {{
-      background: var(--card) !important;
-      color: var(--ink) !important;
-    }}
-    [data-baseweb="menu"] [data-baseweb="menu-item"][aria-selected="true"],
-    ul[role="listbox"] [data-baseweb="menu-item"][aria-selected="true"],
-    [data-baseweb="menu"] [data-baseweb="menu-item"]:hover,
-    ul[role="listbox"] [data-baseweb="menu-item"]:hover {{
-      background: var(--hover) !important;
-      color: var(--ink) !important;
-    }}
-    
-    /* Expander (header + open content) */
-    [data-testid="stExpander"] > details {{
-      background: #ffffff !important;
-      border: 1px solid var(--border) !important;
-      border-radius: 12px !important;
-      overflow: hidden !important;
-    }}
-    [data-testid="stExpander"] summary,
-    [data-testid="stExpander"] div[role="button"] {{
-      background: #f3f4f6 !important;
-      color: var(--ink) !important;
-      border-bottom: 1px solid var(--border) !important;
-      padding: .65rem .9rem !important;
-    }}
-    [data-testid="stExpander"] > details[open] > div {{
-      background: #ffffff !important;
-      padding: .75rem .9rem !important;
-    }}
-    
-    /* Alerts (readable text) */
-    .stAlert {{
-      background: #ecfdf5 !important;
-      border: 1px solid #bbf7d0 !important;
-      color: #064e3b !important;
-      border-radius: 12px !important;
-    }}
-    .stAlert * {{
-      color: #064e3b !important;
-    }}
-    
-    /* Tables / tabs / cards */
-    .header-logo-wrap {{
-      display: flex;
-      justify-content: center;
-      align-items: center;
-      margin: 2px 0 8px 0;
-    }}
-    .header-logo-img {{
-      width: clamp(520px, 40vw, 1100px);
-      height: auto;
-      display: block;
-    }}
-    
-    .section {{
-      background: var(--card);
-      border-radius: 16px;
-      padding: 16px 18px;
-      border: 1px solid rgba(0,0,0,0.06);
-      margin-bottom: 16px;
-      box-shadow: 0 2px 12px rgba(0,0,0,0.06);
-    }}
-    
-    .kpi-grid {{
-      display: grid;
-      grid-template-columns: repeat(6, minmax(0,1fr));
-      gap: 14px;
-      margin: 8px 0 18px 0;
-    }}
-    .kpi {{
-      background: var(--card);
-      border-radius: 16px;
-      padding: 14px 16px;
-      border: 1px solid rgba(0,0,0,0.06);
-      box-shadow: 0 2px 12px rgba(0,0,0,0.06);
-    }}
-    .kpi .label {{
-      font-size: 12px;
-      color: var(--muted);
-      font-weight: 700;
-      text-transform: uppercase;
-      letter-spacing: .04em;
-    }}
-    .kpi .value {{
-      font-size: 28px;
-      font-weight: 900;
-      color: var(--accent);
-      line-height: 1.2;
-      margin-top: 2px;
-    }}
-    .muted {{
-      color: var(--muted);
-      font-size: 13px;
-    }}
-    .spacer-12 {{
-      height: 12px;
-    }}
-    
-    .stTabs [data-baseweb="tab-list"] {{
-      gap: 6px;
-    }}
-    .stTabs [data-baseweb="tab"] {{
-      color: var(--muted);
-      background: var(--card);
-      border-radius: 12px 12px 0 0;
-      padding: 10px 14px;
-      font-weight: 700;
-      border: 1px solid var(--grid);
-      border-bottom: none;
-    }}
-    .stTabs [aria-selected="true"] {{
-      color: var(--accent) !important;
-      background: var(--card) !important;
-      box-shadow: 0 -2px 12px rgba(0,0,0,0.06);
-    }}
-    
-    /* Chat/coach (always light) */
-    .edgecoach {{
-      background: #fff !important;
-      color: var(--ink) !important;
-      border: 1px solid var(--grid) !important;
-      border-radius: 12px !important;
-      padding: 12px;
-    }}
-    .edgecoach .stTextInput input,
-    .edgecoach .stTextArea textarea {{
-      background: #fff !important;
-      color: var(--ink) !important;
-      border-color: var(--grid) !important;
-    }}
-    .edgecoach .msg-user {{
-      background: color-mix(in oklab, white, var(--accent) 12%);
-      border: 1px solid color-mix(in oklab, var(--accent), #000 20%);
-      color: var(--ink);
-      border-radius: 10px;
-      padding: 10px 12px;
-    }}
-    .edgecoach .msg-assistant {{
-      background: color-mix(in oklab, white, #000 6%);
-      border: 1px solid var(--grid);
-      color: var(--ink);
-      border-radius: 10px;
-      padding: 10px 12px;
-    }}
-    
-    /* Watermark and other common elements */
-    .live-banner {{
-      background: color-mix(in oklab, {PURPLE_HEX}, white 85%);
-      color: {PURPLE_HEX};
-      padding: 8px 16px;
-      border-radius: 12px;
-      text-align: center;
-      font-weight: 700;
-      margin-bottom: 16px;
-      border: 1px solid color-mix(in oklab, {PURPLE_HEX}, white 70%);
-    }}
-    
-    .ea-empty-wrap {{
-      text-align: center;
-      padding: 60px 20px;
-    }}
-    .ea-empty-title {{
-      font-size: 24px;
-      font-weight: 700;
-      color: var(--muted);
-      margin-bottom: 20px;
-    }}
-    .ea-empty-btn {{
-      max-width: 400px;
-      margin: 0 auto;
-    }}
-    
-    .ea-watermark {{
-      text-align: center;
-      opacity: 0.3;
-      margin-top: 40px;
-      padding: 20px;
-    }}
-    .ea-watermark img {{
-      max-width: 180px;
-      height: auto;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_theme_css("light"), unsafe_allow_html=True)
 
 
 # ───────────────────────── Favicon helpers ─────────────────────────
-def _square_canvas(im: Image.Image, size: int = 256) -> Image.Image:
-    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    im = im.copy()
-    im.thumbnail((size-8, size-8), Image.LANCZOS)
-    x = (size - im.width)//2
-    y = (size - im.height)//2
-    canvas.paste(im, (x, y), im)
-    return canvas
+def _b64(data: bytes) -> str:
+    """Base64 text for a data: URI (binascii's C encoder, no newline, one decode)."""
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
 
 
-def setup_favicon():
-    """Set up the favicon in browser tab."""
-    try:
-        if RAW_ICON.exists():
-            im = Image.open(RAW_ICON).convert("RGBA")
-            im = _square_canvas(im, 256)
-            im.save(FAVI_PNG, optimize=True)
-        png = FAVI_PNG if FAVI_PNG.exists() else RAW_ICON
-        if not png.exists():
-            return
-        b64 = base64.b64encode(png.read_bytes()).decode()
-        components.html(
-            f"""
+def _b64_file(path: Path) -> str:
+    """_b64() of a file, encoded straight from an mmap so the raw bytes are never copied."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _b64(mm)
+
+
+@st.cache_resource(show_spinner=False)
+def _favicon_script(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Favicon <script> for the icon at `path`, built once per file version
+    (mtime_ns/size only key the cache). The file is served as-is; the square,
+    optimised PNG is produced offline by scripts/build_favicon.py.
+    The script targets window.parent so it works both inline and from the
+    components iframe fallback.
+    """
+    b64 = _b64_file(Path(path))
+    return f"""
             <script>
             (function(){{
+              const doc = window.parent.document;
               const href = "data:image/png;base64,{b64}";
               const rels = ["icon","shortcut icon"];
               rels.forEach(r => {{
-                let link = document.querySelector(`link[rel="${{r}}"]`);
+                let link = doc.querySelector(`link[rel="${{r}}"]`);
                 if (!link) {{
-                  link = document.createElement('link');
+                  link = doc.createElement('link');
                   link.rel = r;
-                  document.head.appendChild(link);
+                  doc.head.appendChild(link);
                 }}
                 link.type = 'image/png';
                 link.href = href;
               }});
             }})();
             </script>
-            """,
-            height=0, width=0
-        )
+            """
+
+
+def _pending_favicon_script() -> str:
+    """The favicon <script> if this session hasn't emitted it yet, else ""."""
+    if st.session_state.get("_favicon_done"):
+        return ""
+    for png in (FAVI_PNG, RAW_ICON):
+        try:
+            stat = png.stat()
+        except OSError:
+            continue
+        try:
+            return _favicon_script(str(png), stat.st_mtime_ns, stat.st_size)
+        except Exception:
+            return ""
+    return ""
+
+
+def setup_favicon():
+    """
+    Set up the favicon in browser tab. The icon link outlives the rerun that
+    set it, so it is only emitted once per session.
+    """
+    script = _pending_favicon_script()
+    if not script:
+        return
+    try:
+        try:
+            # Runs in the main document: no iframe mount for a head mutation
+            st.html(script, unsafe_allow_javascript=True)
+        except TypeError:
+            # Streamlit without unsafe_allow_javascript
+            import streamlit.components.v1 as components
+            components.html(script, height=0, width=0)
+        st.session_state["_favicon_done"] = True
     except Exception:
         pass
 
 
+def bootstrap(theme: str = "light", favicon: bool = True):
+    """
+    inject_theme() + setup_favicon() as one frontend element: on a session's
+    first run the theme CSS and the favicon script go out in a single
+    st.html call; later runs only need the CSS. Pass favicon=False when
+    st.set_page_config(page_icon=...) already set the icon.
+    """
+    script = _pending_favicon_script() if favicon else ""
+    if not script:
+        inject_theme()
+        return
+    st.session_state["ui_theme"] = "light"
+    _enable_altair_theme()
+    try:
+        st.html(_theme_css(theme) + script, unsafe_allow_javascript=True)
+    except TypeError:
+        # Streamlit without unsafe_allow_javascript
+        import streamlit.components.v1 as components
+        st.markdown(_theme_css(theme), unsafe_allow_html=True)
+        components.html(script, height=0, width=0)
+    st.session_state["_favicon_done"] = True
+
+
 # ───────────────────────── Header (light logo) ────────────────────
+@functools.lru_cache(maxsize=8)
+def _img_attrs(path: Path) -> str:
+    """
+    Intrinsic width/height (so layout reserves the logo's box before it
+    decodes) plus off-main-thread decoding; the header is above the fold.
+    """
+    attrs = "decoding='async' loading='eager'"
+    try:
+        from PIL import Image
+        # reads the header only; known format, so Pillow skips sniffing every plugin
+        fmt = "WEBP" if path.suffix.lower() == ".webp" else "PNG"
+        with Image.open(path, formats=[fmt]) as im:
+            w, h = im.size
+        return f"width='{w}' height='{h}' {attrs}"
+    except Exception:
+        return attrs
+
+
+@functools.lru_cache(maxsize=8)
 def _img_tag_from_file(path: Path) -> str:
+    """<img> tag with the file inlined as base64; encoded once per path per process."""
     try:
-        b64 = base64.b64encode(path.read_bytes()).decode()
-        return f"<img class='header-logo-img' src='data:image/png;base64,{b64}' alt='Edge Analysis'/>"
+        b64 = _b64_file(path)
+        mime = "image/webp" if path.suffix.lower() == ".webp" else "image/png"
+        return (f"<img class='header-logo-img' {_img_attrs(path)} "
+                f"src='data:{mime};base64,{b64}' alt='Edge Analysis'/>")
     except Exception:
         return ""
 
 
+def _logo_img_tag(path: Path) -> str:
+    """
+    <img> tag for the logo: a plain app/static URL the browser can cache when
+    static serving is enabled, else the base64-inlined file.
+    """
+    try:
+        served = st.get_option("server.enableStaticServing") and path.parent == STATIC_DIR
+    except Exception:
+        served = False
+    if served:
+        return (f"<img class='header-logo-img' {_img_attrs(path)} "
+                f"src='{STATIC_URL}/{path.name}' alt='Edge Analysis'/>")
+    return _img_tag_from_file(path)
+
+
+@functools.lru_cache(maxsize=2)
+def header_html(_theme_ignored: str = "light") -> str:
+    """
+    Centered Edge Analysis logo header as one line of HTML ("" without a logo
+    file), so pages can append it to their own CSS markdown call. Built once
+    per process; logo files and static serving are fixed at startup.
+    """
+    logo_path = HEADER_LOGO_LIGHT if HEADER_LOGO_LIGHT.exists() else HEADER_LOGO_DARK
+    if not (logo_path and logo_path.exists()):
+        return ""
+    return (
+        '<div style="display:flex; justify-content:center; margin: 1rem 0;">'
+        f"{_logo_img_tag(logo_path)}</div>"
+    )
+
+
 def inject_header(_theme_ignored: str = "light"):
     """Inject centered Edge Analysis logo header."""
-    logo_path = HEADER_LOGO_LIGHT if HEADER_LOGO_LIGHT.exists() else HEADER_LOGO_DARK
-    if logo_path and logo_path.exists():
-        st.markdown(
-            f"""
-            <div style="display:flex; justify-content:center; margin: 1rem 0;">
-                {_img_tag_from_file(logo_path)}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    html = header_html()
+    if html:
+        st.markdown(html, unsafe_allow_html=True)
 
 
 # ───────────────────────── Chart styling helper ───────────────────
+@functools.lru_cache(maxsize=2)
+def _styler_for(chart_bg: str):
+    """Styler for `chart_bg`; the same function object is returned on every call."""
+    def _styler(chart):
+        return chart.configure(background=chart_bg).configure_view(fill=chart_bg)
+    return _styler
+
+
 def get_chart_styler():
     """
     Return a chart styling function for Altair charts.
     Configures background and view fill to match light theme.
     """
-    c = LIGHT
-    def _styler(chart):
-        return chart.configure(background=c["chart_bg"]).configure_view(fill=c["chart_bg"])
-    return _styler
+    return _styler_for(LIGHT["chart_bg"])
 
 # ---------------------------------------------------------------------------
 # Compatibility functions for legacy references
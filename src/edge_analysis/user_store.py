@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+
+# Optional: orjson parses/serializes the store several times faster (stdlib fallback)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Folder this file lives in: src/edge_analysis/
 _ROOT = Path(__file__).resolve().parent
@@ -10,6 +21,22 @@ _ROOT = Path(__file__).resolve().parent
 # JSON file that actually stores all user data
 _STORE_FILE = _ROOT / "user_store.json"
 
+# Parsed store plus the (st_mtime_ns, st_size) it was read at; the file is
+# only re-parsed when that changes. Public functions never mutate it in place.
+_cache: Optional[Dict[str, Any]] = None
+_cache_key: Optional[tuple] = None
+
+# Within this many seconds of the last check the cache is trusted without even
+# a stat(); this process's own writes refresh it immediately, so only changes
+# made by another process can be seen this late.
+_STAT_TTL = 5.0
+_cache_checked = float("-inf")
+
+# Streamlit sessions are threads in one process: upsert/delete hold this
+# around their load-merge-save so concurrent logins don't drop each other's
+# changes.
+_write_lock = threading.Lock()
+
 
 # ----------------------------- low-level helpers -----------------------------
 
@@ -34,32 +61,94 @@ def _empty_store() -> Dict[str, Any]:
     return {"version": 1, "users": {}}
 
 
-def _load_raw_store() -> Dict[str, Any]:
-    """Load the entire store from disk. If anything goes wrong, return empty."""
-    if not _STORE_FILE.exists():
-        return _empty_store()
+def _stat_key() -> Optional[tuple]:
+    try:
+        st = _STORE_FILE.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
+def _parse_store(raw: bytes) -> Dict[str, Any]:
+    """
+    Parse and normalize the store file contents. Only runs on a cache miss;
+    cached dicts have already been through here. If anything goes wrong,
+    return empty.
+    """
     try:
-        data = json.loads(_STORE_FILE.read_text(encoding="utf-8"))
-        if not isinstance(data, dict):
-            return _empty_store()
-        if "users" not in data or not isinstance(data["users"], dict):
-            data["users"] = {}
-        if "version" not in data:
-            data["version"] = 1
-        return data
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
     except Exception:
         # Corrupt / unreadable file -> start fresh
         return _empty_store()
+    if not isinstance(data, dict):
+        return _empty_store()
+    if not isinstance(data.get("users"), dict):
+        data["users"] = {}
+    data.setdefault("version", 1)
+    return data
+
+
+def _load_raw_store() -> Dict[str, Any]:
+    """
+    Load the entire store from disk (cached until the file changes). If
+    anything goes wrong, return empty.
+    """
+    global _cache, _cache_key, _cache_checked
+    now = time.monotonic()
+    if _cache is not None and now - _cache_checked < _STAT_TTL:
+        return _cache
+    key = _stat_key()
+    if key is None:
+        return _empty_store()
+    if _cache is not None and key == _cache_key:
+        _cache_checked = now
+        return _cache
+
+    try:
+        # One open: key the cache on the fstat of the handle the bytes came from
+        with open(_STORE_FILE, "rb") as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+    except OSError:
+        return _empty_store()
+    key = (st.st_mtime_ns, st.st_size)
+    data = _parse_store(raw)
+    _cache, _cache_key, _cache_checked = data, key, now
+    return data
 
 
 def _save_raw_store(store: Dict[str, Any]) -> None:
-    """Write the entire store to disk. Fail silently if write is not allowed."""
+    """
+    Write the entire store to disk atomically (unique temp file + os.replace,
+    so a crash mid-write can't leave a truncated store and concurrent writers
+    never share a temp file). Fail silently if write is not allowed.
+    """
+    global _cache, _cache_key, _cache_checked
+    tmp = None
     try:
-        _STORE_FILE.write_text(json.dumps(store, indent=2, sort_keys=True), encoding="utf-8")
+        if orjson is not None:
+            payload = orjson.dumps(store, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(store, indent=2, sort_keys=True).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=_STORE_FILE.parent, prefix=_STORE_FILE.name, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates 0600; keep the store's existing permissions
+            try:
+                os.fchmod(f.fileno(), _STORE_FILE.stat().st_mode & 0o777)
+            except OSError:
+                pass
+            f.write(payload)
+        os.replace(tmp, _STORE_FILE)
     except Exception:
         # On Streamlit Cloud / read-only envs we just skip saving
-        pass
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return
+    # What we just wrote is what the next load would parse
+    _cache, _cache_key, _cache_checked = store, _stat_key(), time.monotonic()
 
 
 # ----------------------------- public API (simple) ---------------------------
@@ -68,6 +157,9 @@ def _save_raw_store(store: Dict[str, Any]) -> None:
 def get_user(user_id: str) -> Optional[Dict[str, Any]]:
     """
     Return the record for a given Notion user id, or None if not found.
+
+    The record is shared with the in-process cache: treat it as read-only
+    and go through upsert_user() to change it.
     """
     if not user_id:
         return None
@@ -91,22 +183,23 @@ def upsert_user(user_id: str, **fields: Any) -> Dict[str, Any]:
     if not user_id:
         raise ValueError("user_id is required")
 
-    import time as _time
+    with _write_lock:
+        # copies: the loaded store is shared with the in-process cache
+        store = dict(_load_raw_store())
+        users = dict(store["users"])
 
-    store = _load_raw_store()
-    users = store["users"]
-
-    current = users.get(user_id, {})
-    if not isinstance(current, dict):
-        current = {}
+        existing = users.get(user_id)
+        current = dict(existing) if isinstance(existing, dict) else {}
 
-    # merge new fields into existing record
-    current.update(fields)
-    current["last_updated"] = _time.time()
+        # merge new fields into existing record; nothing new -> no rewrite
+        current.update(fields)
+        if current == existing:
+            return existing
+        current["last_updated"] = time.time()
 
-    users[user_id] = current
-    store["users"] = users
-    _save_raw_store(store)
+        users[user_id] = current
+        store["users"] = users
+        _save_raw_store(store)
     return current
 
 
@@ -120,15 +213,15 @@ def set_user_db(user_id: str, db_id: str, template: Optional[str] = None) -> Dic
     return upsert_user(user_id, **data)
 
 
-def list_users() -> Dict[str, Dict[str, Any]]:
+def list_users() -> Mapping[str, Dict[str, Any]]:
     """
-    Return the mapping of all users.
+    Return a read-only view of all users (no copy of the cached store).
 
     Shape:
         { "<user_id>": { ...record... }, ... }
     """
     store = _load_raw_store()
-    return store["users"]
+    return MappingProxyType(store["users"])
 
 
 def delete_user(user_id: str) -> None:
@@ -137,7 +230,8 @@ def delete_user(user_id: str) -> None:
     """
     if not user_id:
         return
-    store = _load_raw_store()
-    if user_id in store["users"]:
-        store["users"].pop(user_id, None)
-        _save_raw_store(store)
\ No newline at end of file
+    with _write_lock:
+        store = _load_raw_store()
+        if user_id in store["users"]:
+            users = {k: v for k, v in store["users"].items() if k != user_id}
+            _save_raw_store({**store, "users": users})
\ No newline at end of file
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+# Same src-path setup as app.py
+_SRC = Path(__file__).resolve().parent.parent / "src"
+if _SRC.exists():
+    sys.path.insert(0, str(_SRC))
+
+import pandas as pd
+
+from edge_analysis.ui.tabs import _add_date_buckets, _to_datetime_iso_first
+
+
+def test_offset_iso_mixed_with_export_style_date():
+    # Notion API date next to an export-style "(GMT+1)" date
+    df = pd.DataFrame({"Date": ["2024-01-05T10:00:00+01:00", "January 6, 2024 10:00 AM (GMT+1)"]})
+    out = _add_date_buckets(df)
+    assert out["__Date"].notna().all()
+    assert out["__Date"].dt.tz is None
+    assert out["__Bucket_D"].tolist() == [pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-06")]
+
+
+def test_naive_mixed_with_different_offsets():
+    df = pd.DataFrame({"Date": ["2024-01-05", "Jan 6 2024 10:00 +0100", "Jan 7 2024 10:00 +0200"]})
+    out = _add_date_buckets(df)
+    assert out["__Date"].notna().all()
+    assert out["__Bucket_D"].tolist() == [
+        pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-06"), pd.Timestamp("2024-01-07"),
+    ]
+
+
+def test_mixed_iso_offsets_and_junk_coerce():
+    s = pd.Series(["2024-01-05T10:00:00+01:00", "2024-01-05T10:00:00+02:00", "not a date", None])
+    naive = _to_datetime_iso_first(s)
+    assert naive.dt.tz is None
+    assert naive.notna().tolist() == [True, True, False, False]
+    aware = _to_datetime_iso_first(s, utc=True)
+    assert str(aware.dt.tz) == "UTC"
+    assert aware.iloc[1] == pd.Timestamp("2024-01-05T08:00:00Z")